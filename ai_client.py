@@ -5,11 +5,13 @@ import os
 import random
 import pygame
 import requests
-from openai import OpenAI
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from openai import OpenAI, OpenAIError
 from dotenv import load_dotenv
 
 from constants import *
-from image_utils import process_generated_image, save_and_load_sprite
+from image_utils import process_generated_image, save_and_load_sprite, load_sprite
 from prompts import (
     PLAYER_SPRITE_PROMPT,
     MONSTER_SPRITE_PROMPT,
@@ -26,6 +28,14 @@ from prompts import (
 # Load environment variables
 load_dotenv()
 
+# Images come back inline as base64, so no second request is needed to fetch them
+IMAGE_REQUEST_PARAMS = {
+    "model": "dall-e-3",
+    "size": "1024x1024",
+    "quality": "standard",
+    "response_format": "b64_json",
+}
+
 
 class OpenAIClient:
     """Client for OpenAI API interactions."""
@@ -38,34 +48,37 @@ class OpenAIClient:
             "Content-Type": "application/json"
         }
         self.client = OpenAI()
+        
+        # Shared session keeps connections to the API alive between requests
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=8,
+            max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504],
+                              allowed_methods=None)
+        )
+        self.session.mount("https://", adapter)
 
     def generate_image(self, prompt):
-        """Generate an image using DALL-E."""
+        """Generate an image using DALL-E and return the decoded image bytes."""
         try:
-            response = self.client.images.generate(
-                model="dall-e-3",
-                prompt=prompt,
-                size="1024x1024",
-                quality="standard",
-                response_format="b64_json"
-            )
-            image_base64 = response.data[0].b64_json
-            image_bytes = base64.b64decode(image_base64)
-            return image_bytes
+            response = self.client.images.generate(prompt=prompt, **IMAGE_REQUEST_PARAMS)
+            return base64.b64decode(response.data[0].b64_json)
 
-        except requests.exceptions.RequestException as e:
+        except OpenAIError as e:
             print(f"API Error: {str(e)}")
             raise
 
     def generate_chat_completion(self, messages):
         """Generate a chat completion using GPT."""
-        response = requests.post(
+        response = self.session.post(
             f"{self.base_url}/chat/completions",
-            headers=self.headers,
             json={
                 "model": "gpt-3.5-turbo",
                 "messages": messages
-            }
+            },
+            timeout=(5, 60)
         )
         response.raise_for_status()
         return response.json()
@@ -84,7 +97,7 @@ class SpriteGenerator:
     def generate_sprite(self, prompt, cache_path, game=None):
         """Generate and cache a sprite using DALL-E."""
         if os.path.exists(cache_path):
-            return pygame.image.load(cache_path)
+            return load_sprite(cache_path)
         
         # Loading screens removed - generation now uses placeholders
         
@@ -118,7 +131,7 @@ class SpriteGenerator:
         
         # Check if both sprite and stats are cached
         if os.path.exists(monster_path) and os.path.exists(stats_path):
-            monster_sprite = pygame.image.load(monster_path)
+            monster_sprite = load_sprite(monster_path)
             with open(stats_path, 'r') as f:
                 monster_stats = f.read()
             return monster_sprite, monster_stats
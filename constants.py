@@ -13,6 +13,7 @@ MAX_MONSTER_COUNT = 50
 # Game balance constants
 PLAYER_BASE_HEALTH = 5
 PLAYER_BASE_ATTACK = 0.5
+PLAYER_ATTACK_RANGE = TILE_SIZE * 2.5  # 2.5 tiles range for hit-and-run tactics
 PLAYER_SPEED = 5
 MONSTER_HEALTH_MULTIPLIER = 1  # Monster HP = level * multiplier
 MONSTER_DAMAGE_MULTIPLIER = 1  # Monster damage = level * multiplier
@@ -38,6 +39,7 @@ MONSTER_ATTACK_COOLDOWN = 1000  # 1 second
 # Visual effect timing constants (in frames at 60 FPS)
 DAMAGE_FLASH_DURATION = 20     # ~1/3 second damage flash
 ATTACK_FLASH_DURATION = 10     # ~1/6 second attack flash
+SHOW_IDLE_EFFECT_RINGS = True  # Draw ready/cooldown rings around entities, not just hit flashes
 
 # AI behavior timing constants (in frames at 60 FPS)
 AI_BEHAVIOR_TIMER_MIN = 60     # 1 second minimum behavior duration
@@ -83,6 +85,11 @@ GRAY = (128, 128, 128)
 DARK_GRAY = (64, 64, 64)
 GOLD = (255, 215, 0)
 
+# Save file constants
+SAVE_FILE = 'savegame.msgpack'
+LEGACY_SAVE_FILE = 'savegame.json'  # Pre-3.0 JSON saves, still loadable
+SAVE_STREAMING_THRESHOLD = 5000  # Entities above which the stdlib JSON fallback streams to disk
+
 # Cache directories
 CACHE_SPRITES_DIR = 'cache/sprites'
 CACHE_MONSTERS_DIR = 'cache/monsters'
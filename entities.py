@@ -4,7 +4,7 @@ import math
 import random
 import pygame
 from constants import *
-from image_utils import scale_sprite
+from image_utils import scale_sprite, scale_sprite_for_death_miniboss
 
 
 class MonsterRenderInfo:
@@ -85,6 +85,15 @@ class MonsterRenderInfo:
         return hits_to_kill > 1
 
 
+class InventoryItem:
+    """Lightweight inventory entry restored from a save; only the type matters."""
+    
+    __slots__ = ('item_type',)
+    
+    def __init__(self, item_type):
+        self.item_type = item_type
+
+
 class Entity:
     """Base class for all game entities with position and sprite."""
     
@@ -94,6 +103,7 @@ class Entity:
         self.sprite = sprite
         self.damage_flash_timer = 0
         self.attack_flash_timer = 0
+        self.save_cache = None  # Serialized dict reused across saves (see GameState.save_game)
     
     def get_center(self):
         """Get the center coordinates of the entity."""
@@ -142,6 +152,9 @@ class Monster(Entity):
         self.alert_behavior_timer = 0
         self.target_miniboss = None  # Reference to targeted mini-boss
         
+        # Built on demand and reused every frame until update_render_info is called
+        self.render_info = None
+        
         # Apply sprite scaling using render info
         if sprite:
             self.update_render_info()
@@ -174,7 +187,7 @@ class Monster(Entity):
     
     def get_render_info(self):
         """Get the current render info, creating it if needed."""
-        if not hasattr(self, 'render_info') or self.render_info is None:
+        if self.render_info is None:
             self.update_render_info()
         return self.render_info
     
@@ -191,14 +204,14 @@ class Player(Entity):
         self.health = PLAYER_BASE_HEALTH
         self.level = 1
         self.inventory = []
+        self.inventory_counts = {"weapon": 0, "armor": 0, "potion": 0}  # Kept in sync with inventory
         self.attack_power = PLAYER_BASE_ATTACK
-        self.attack_range = TILE_SIZE * 2.5  # 2.5 tiles range for hit-and-run tactics
+        self.attack_range = PLAYER_ATTACK_RANGE
         self.last_attack_time = 0
     
     def get_max_health(self):
         """Calculate player's current max health based on armor."""
-        armor_count = len([item for item in self.inventory if item.item_type == 'armor'])
-        return PLAYER_BASE_HEALTH + (armor_count * ARMOR_HEALTH_BONUS)
+        return PLAYER_BASE_HEALTH + (self.inventory_counts["armor"] * ARMOR_HEALTH_BONUS)
     
     def can_attack(self, current_time):
         """Check if player can attack based on cooldown."""
@@ -242,6 +255,17 @@ class Player(Entity):
                 self.health = min(max_health, self.health + scaled_heal)
         
         self.inventory.append(item)
+        self.inventory_counts[item.item_type] = self.inventory_counts.get(item.item_type, 0) + 1
+    
+    def restore_inventory(self, inventory_counts):
+        """Replace the inventory with plain items matching the given per-type counts."""
+        self.inventory_counts = {"weapon": 0, "armor": 0, "potion": 0}
+        self.inventory_counts.update(inventory_counts)
+        self.inventory = [
+            InventoryItem(item_type)
+            for item_type, count in inventory_counts.items()
+            for _ in range(count)
+        ]
     
     def get_effect_message(self, item):
         """Get the message describing what an item does."""
@@ -317,9 +341,7 @@ class DeathSprite(Entity):
         
         # Scale sprite for mini-bosses
         if is_miniboss and sprite:
-            import pygame
-            scaled_size = int(TILE_SIZE * DEATH_SPRITE_MINIBOSS_SCALE)
-            self.sprite = pygame.transform.scale(sprite, (scaled_size, scaled_size))
+            self.sprite = scale_sprite_for_death_miniboss(sprite)
     
     def update(self):
         """Update fade animation and return True if sprite should be removed."""
@@ -41,6 +41,8 @@ class Game:
             self.render()
             self.clock.tick(60)
         
+        # Let any background save finish before exiting
+        self.game_state.flush_saves()
         pygame.quit()
     
     def handle_events(self):
@@ -101,6 +103,9 @@ class Game:
             elif event.type == pygame.WINDOWFOCUSGAINED:
                 print("Window focus gained - resuming game")
                 self.game_state.paused = False
+            elif event.type in (pygame.WINDOWEXPOSED, pygame.WINDOWRESTORED, pygame.VIDEOEXPOSE):
+                # The window contents were lost; partial updates and skipped frozen frames won't repaint them
+                self.render_system.invalidate()
             elif event.type == pygame.MOUSEBUTTONDOWN:
                 if event.button == 1:  # Left click
                     self._handle_mouse_click(event.pos)
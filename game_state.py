@@ -1,12 +1,100 @@
 """Game state management for tracking all game data."""
 
+import glob
+import hashlib
+import json
+import os
 import random
-import pygame
+import time
+import traceback
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from constants import *
 from entities import Monster, Player, LootItem, Stairway, DeathSprite
 from sprite_manager import SpriteManager
+from image_utils import archive_cached_sprite, scale_sprite, scale_sprite_for_miniboss, scale_sprite_for_stairway, scale_sprite_for_death_miniboss
 from preferences import PreferencesManager
 
+try:
+    import msgpack  # Compact binary save format
+except ImportError:
+    msgpack = None
+
+try:
+    import orjson  # C-accelerated JSON encoder/decoder for save files
+except ImportError:
+    orjson = None
+
+
+def _pack_snapshot(snapshot):
+    """Serialize and compress a level snapshot into a standalone blob."""
+    if orjson is not None:
+        payload = orjson.dumps(snapshot)
+    elif msgpack is not None:
+        payload = msgpack.packb(snapshot, use_bin_type=True)
+    else:
+        payload = json.dumps(snapshot, separators=(',', ':')).encode('utf-8')
+    return zlib.compress(payload, 3)
+
+
+def _unpack_snapshot(blob):
+    """Inverse of _pack_snapshot; sniffs JSON vs MessagePack like load_game."""
+    payload = zlib.decompress(blob)
+    if payload[:1] == b'{':
+        return orjson.loads(payload) if orjson is not None else json.loads(payload)
+    return msgpack.unpackb(payload, raw=False)
+
+
+def _snapshot_path(save_filename, snapshot_hash):
+    """Sidecar file holding the level snapshot referenced from a save file."""
+    return f"{os.path.splitext(save_filename)[0]}.snapshot.{snapshot_hash}.z"
+
+
+@contextmanager
+def _atomic_file(path, mode='wb'):
+    """Open a temp file that is renamed over `path` on success, so readers never see a partial file."""
+    temp_path = f"{path}.tmp"
+    try:
+        with open(temp_path, mode) as f:
+            yield f
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+
+
+def _write_file_atomically(path, payload):
+    """Write bytes to `path` through a temp file; see _atomic_file."""
+    with _atomic_file(path) as f:
+        f.write(payload)
+
+
+def _write_save_files(filename, payload, snapshot_path, snapshot_blob):
+    """Background job: write the snapshot sidecar and save file, then prune old sidecars."""
+    try:
+        if snapshot_blob is not None and not os.path.exists(snapshot_path):
+            _write_file_atomically(snapshot_path, snapshot_blob)
+        if payload is not None:
+            _write_file_atomically(filename, payload)
+        _remove_snapshot_files(filename, keep=snapshot_path)
+        print(f"Game saved to {filename}")
+    except Exception as e:
+        print(f"Failed to save game: {e}")
+
+
+def _remove_snapshot_files(save_filename, keep=None):
+    """Delete snapshot sidecars for a save file, except the one at `keep`."""
+    for path in glob.glob(_snapshot_path(save_filename, '*')):
+        if path != keep:
+            try:
+                os.remove(path)
+            except OSError as e:
+                print(f"Failed to remove old snapshot {path}: {e}")
+
 
 class GameState:
     """Manages all game state data and provides clean interfaces for systems."""
@@ -32,6 +120,15 @@ class GameState:
         
         # Level snapshot for retry functionality
         self.level_start_snapshot = None
+        # Encoded form of level_start_snapshot, built once and reused by every save
+        self._snapshot_blob = None
+        self._snapshot_hash = None
+        # Snapshot kept on disk after loading, decoded only if a retry happens
+        self._deferred_snapshot_path = None
+        
+        # Save files are written on a single background thread, in order
+        self._save_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="savegame")
+        self._last_save = None
         
         # Entities
         self.player = None
@@ -135,10 +232,8 @@ class GameState:
     
     def _capture_level_snapshot(self):
         """Capture a snapshot of the game state at the start of a level."""
-        # Count inventory items for compact storage
-        inventory_counts = {"weapon": 0, "armor": 0, "potion": 0}
-        for item in self.player.inventory:
-            inventory_counts[item.item_type] += 1
+        # Copy inventory counts so later pickups don't alter the snapshot
+        inventory_counts = dict(self.player.inventory_counts)
         
         snapshot = {
             "level": self.level,
@@ -188,9 +283,16 @@ class GameState:
             }
             snapshot["loot_items"].append(loot_data)
         
-        self.level_start_snapshot = snapshot
+        self._set_level_snapshot(snapshot)
         print(f"Captured level {self.level} start snapshot")
     
+    def _set_level_snapshot(self, snapshot, blob=None, snapshot_hash=None):
+        """Replace the level snapshot, dropping any stale encoded or deferred copy."""
+        self.level_start_snapshot = snapshot
+        self._snapshot_blob = blob
+        self._snapshot_hash = snapshot_hash
+        self._deferred_snapshot_path = None
+    
     def _generate_monster_level_mix(self, total_monsters):
         """Generate a mix of monster levels for the current dungeon level."""
         monster_levels = []
@@ -285,7 +387,6 @@ class GameState:
                 item_variant = self.preferences.get_random_variant(item_type)
                 
                 # Generate unique key for this loot item
-                import time
                 item_key = f"item_{item_type}_{item_variant}_{int(time.time() * 1000000) % 1000000}"
                 
                 # Get placeholder sprite, real sprite loads in background
@@ -325,7 +426,6 @@ class GameState:
         item_variant = self.preferences.get_random_variant(item_type)
         
         # Generate unique key for this loot item
-        import time
         item_key = f"item_{item_type}_{item_variant}_{int(time.time() * 1000000) % 1000000}"
         
         # Get placeholder sprite, real sprite loads in background
@@ -358,8 +458,7 @@ class GameState:
         stairway_sprite = self.sprite_manager.get_sprite('stairway', 'stairway', priority=2)
         
         # Scale stairway sprite to be more prominent
-        scaled_size = int(TILE_SIZE * STAIRWAY_SCALE)
-        scaled_sprite = pygame.transform.scale(stairway_sprite, (scaled_size, scaled_size))
+        scaled_sprite = scale_sprite_for_stairway(stairway_sprite)
         
         # Find a safe position for the stairway
         stairway_x, stairway_y = self._find_safe_stairway_position()
@@ -523,10 +622,7 @@ class GameState:
                     monster.update_render_info()
                     render_info = monster.get_render_info()
                     
-                    if render_info.scale_factor != 1.0:
-                        monster.sprite = pygame.transform.scale(new_sprite, (render_info.sprite_size, render_info.sprite_size))
-                    else:
-                        monster.sprite = new_sprite
+                    monster.sprite = scale_sprite(new_sprite, render_info.scale_factor)
         
         # Update loot item sprites
         for loot_item in self.loot_items:
@@ -542,8 +638,7 @@ class GameState:
             new_sprite = self.sprite_manager.sprites.get(self.stairway.sprite_key)
             if new_sprite and new_sprite != self.stairway.sprite:
                 # Scale stairway sprite to be more prominent
-                scaled_size = int(TILE_SIZE * STAIRWAY_SCALE)
-                self.stairway.sprite = pygame.transform.scale(new_sprite, (scaled_size, scaled_size))
+                self.stairway.sprite = scale_sprite_for_stairway(new_sprite)
         
         # Update death sprites
         for death_sprite in self.death_sprites:
@@ -552,8 +647,7 @@ class GameState:
                 if new_sprite and new_sprite != death_sprite.sprite:
                     # Scale for mini-bosses if needed
                     if death_sprite.is_miniboss:
-                        scaled_size = int(TILE_SIZE * DEATH_SPRITE_MINIBOSS_SCALE)
-                        death_sprite.sprite = pygame.transform.scale(new_sprite, (scaled_size, scaled_size))
+                        death_sprite.sprite = scale_sprite_for_death_miniboss(new_sprite)
                     else:
                         death_sprite.sprite = new_sprite
     
@@ -576,10 +670,7 @@ class GameState:
                 # Get base sprite from sprite manager
                 base_sprite = self.sprite_manager.sprites.get(monster.sprite_key)
                 if base_sprite:
-                    if render_info.scale_factor != 1.0:
-                        monster.sprite = pygame.transform.scale(base_sprite, (render_info.sprite_size, render_info.sprite_size))
-                    else:
-                        monster.sprite = base_sprite
+                    monster.sprite = scale_sprite(base_sprite, render_info.scale_factor)
     
     
     def restart_game(self):
@@ -612,8 +703,23 @@ class GameState:
         # Generate first level
         self.generate_level()
     
+    def _load_deferred_snapshot(self):
+        """Decode the level snapshot referenced by the loaded save, if any."""
+        if self.level_start_snapshot or not self._deferred_snapshot_path:
+            return
+        
+        try:
+            with open(self._deferred_snapshot_path, 'rb') as f:
+                blob = f.read()
+            # The sidecar bytes are already the encoded form, so keep them for saves
+            self._set_level_snapshot(_unpack_snapshot(blob), blob, self._snapshot_hash)
+        except Exception as e:
+            print(f"Failed to load level snapshot {self._deferred_snapshot_path}: {e}")
+            self._set_level_snapshot(None)
+    
     def retry_level(self):
         """Retry the current level from the beginning using the saved snapshot."""
+        self._load_deferred_snapshot()
         if not self.level_start_snapshot:
             print("No level snapshot available to retry")
             self.restart_game()
@@ -641,12 +747,7 @@ class GameState:
         self.player.attack_power = player_data["attack_power"]
         
         # Restore inventory
-        self.player.inventory = []
-        inventory_counts = player_data["inventory"]
-        for item_type, count in inventory_counts.items():
-            for _ in range(count):
-                dummy_item = type('Item', (), {'item_type': item_type})()
-                self.player.inventory.append(dummy_item)
+        self.player.restore_inventory(player_data["inventory"])
         
         # Clear entities
         self.monsters = []
@@ -695,18 +796,18 @@ class GameState:
         print(f"Retrying level {self.level}")
         self.set_message(f"Retrying Level {self.level}!", 120)
     
-    def save_game(self, filename="savegame.json"):
-        """Save complete game state to file."""
-        import json
-        import time
+    def save_game(self, filename=SAVE_FILE):
+        """
+        Save complete game state to file.
         
-        # Count inventory items
-        inventory_counts = {"weapon": 0, "armor": 0, "potion": 0}
-        for item in self.player.inventory:
-            inventory_counts[item.item_type] += 1
+        The files are written on a background thread, so True means the save
+        was queued, not that it has reached disk; call flush_saves to wait.
+        """
+        # Inventory counts are maintained incrementally by the player
+        inventory_counts = self.player.inventory_counts
         
         save_data = {
-            "version": "2.1",  # Updated version to include level snapshot
+            "version": "3.1",  # Level snapshot stored in a sidecar file
             "timestamp": time.time(),
             "level": self.level,
             "levels_completed": self.levels_completed,
@@ -720,37 +821,60 @@ class GameState:
             },
             "monsters": [],
             "loot_items": [],
-            "death_sprites": [],
-            "level_start_snapshot": self.level_start_snapshot  # Save the snapshot
+            "death_sprites": []
         }
         
+        # Reference the level snapshot by hash; it only changes once per level,
+        # so repeated saves reuse the sidecar already on disk
+        snapshot_path = None
+        snapshot_blob = None
+        if self.level_start_snapshot:
+            if self._snapshot_blob is None:
+                self._snapshot_blob = _pack_snapshot(self.level_start_snapshot)
+                self._snapshot_hash = hashlib.blake2b(self._snapshot_blob, digest_size=8).hexdigest()
+            snapshot_path = _snapshot_path(filename, self._snapshot_hash)
+            snapshot_blob = self._snapshot_blob
+            save_data["level_start_snapshot_hash"] = self._snapshot_hash
+        elif self._deferred_snapshot_path:
+            # Loaded but never retried: keep pointing at the undecoded sidecar
+            snapshot_path = self._deferred_snapshot_path
+            save_data["level_start_snapshot_hash"] = self._snapshot_hash
+        
+        # Each entity keeps its serialized dict between saves: the fields that never
+        # change are built once, and only the mutable ones are refreshed here.
+        # Reuse is safe because the dicts are encoded before save_game returns.
+        
         # Save monsters (preserve positions and state)
         for monster in self.monsters:
-            monster_data = {
-                "x": monster.x,
-                "y": monster.y,
-                "level": monster.level,
-                "health": monster.health,
-                "max_health": monster.max_health,
-                "damage": monster.damage,
-                "stats": monster.stats,
-                "is_miniboss": monster.is_miniboss,
-                "sprite_key": getattr(monster, 'sprite_key', f"monster_level_{monster.level}")
-            }
+            monster_data = monster.save_cache
+            if monster_data is None:
+                monster_data = monster.save_cache = {
+                    "level": monster.level,
+                    "stats": monster.stats,
+                    "is_miniboss": monster.is_miniboss,
+                    "sprite_key": getattr(monster, 'sprite_key', f"monster_level_{monster.level}")
+                }
+            monster_data["x"] = monster.x
+            monster_data["y"] = monster.y
+            monster_data["health"] = monster.health
+            monster_data["max_health"] = monster.max_health
+            monster_data["damage"] = monster.damage
             save_data["monsters"].append(monster_data)
         
         # Save loot items
         for loot_item in self.loot_items:
-            loot_data = {
-                "x": loot_item.x,
-                "y": loot_item.y,
-                "item_type": loot_item.item_type,
-                "item_variant": getattr(loot_item, 'item_variant', loot_item.item_type),
-                "sprite_key": getattr(loot_item, 'sprite_key', f"item_{loot_item.item_type}"),
-                "is_sliding": getattr(loot_item, 'is_sliding', False),
-                "target_x": getattr(loot_item, 'target_x', loot_item.x),
-                "target_y": getattr(loot_item, 'target_y', loot_item.y)
-            }
+            loot_data = loot_item.save_cache
+            if loot_data is None:
+                loot_data = loot_item.save_cache = {
+                    "item_type": loot_item.item_type,
+                    "item_variant": getattr(loot_item, 'item_variant', loot_item.item_type),
+                    "sprite_key": getattr(loot_item, 'sprite_key', f"item_{loot_item.item_type}")
+                }
+            loot_data["x"] = loot_item.x
+            loot_data["y"] = loot_item.y
+            loot_data["is_sliding"] = loot_item.is_sliding
+            loot_data["target_x"] = loot_item.target_x
+            loot_data["target_y"] = loot_item.target_y
             save_data["loot_items"].append(loot_data)
         
         # Save stairway (only if it exists)
@@ -763,44 +887,81 @@ class GameState:
         
         # Save death sprites
         for death_sprite in self.death_sprites:
-            death_data = {
-                "x": death_sprite.x,
-                "y": death_sprite.y,
-                "is_miniboss": death_sprite.is_miniboss,
-                "fade_timer": death_sprite.fade_timer,
-                "lifetime": death_sprite.lifetime,
-                "alpha": death_sprite.alpha
-            }
+            death_data = death_sprite.save_cache
+            if death_data is None:
+                death_data = death_sprite.save_cache = {
+                    "x": death_sprite.x,
+                    "y": death_sprite.y,
+                    "is_miniboss": death_sprite.is_miniboss,
+                    "lifetime": death_sprite.lifetime
+                }
+            death_data["fade_timer"] = death_sprite.fade_timer
+            death_data["alpha"] = death_sprite.alpha
             save_data["death_sprites"].append(death_data)
         
-        # Write to file
+        # Serialize on the game thread (entity state may change right after),
+        # then hand the bytes to the background writer
         try:
-            with open(filename, 'w') as f:
-                json.dump(save_data, f, indent=2)
-            print(f"Game saved to {filename}")
-            return True
+            entity_count = len(save_data["monsters"]) + len(save_data["loot_items"])
+            if msgpack is not None:
+                payload = msgpack.packb(save_data, use_bin_type=True)
+            elif orjson is not None:
+                payload = orjson.dumps(save_data)
+            elif entity_count <= SAVE_STREAMING_THRESHOLD:
+                payload = json.dumps(save_data, separators=(',', ':')).encode('utf-8')
+            else:
+                # Very large saves stream to disk to avoid building one huge string.
+                # Write the snapshot first so the save never references a missing sidecar.
+                self.flush_saves()
+                if snapshot_blob is not None and not os.path.exists(snapshot_path):
+                    _write_file_atomically(snapshot_path, snapshot_blob)
+                with _atomic_file(filename, 'w') as f:
+                    json.dump(save_data, f, separators=(',', ':'))
+                payload = None
         except Exception as e:
             print(f"Failed to save game: {e}")
             return False
+        
+        self._last_save = self._save_executor.submit(
+            _write_save_files, filename, payload, snapshot_path, snapshot_blob
+        )
+        return True
+    
+    def flush_saves(self):
+        """Block until any background save writes have reached disk."""
+        if self._last_save is not None:
+            self._last_save.result()
+            self._last_save = None
     
-    def load_game(self, filename="savegame.json"):
+    def load_game(self, filename=SAVE_FILE):
         """Load complete game state from file."""
-        import json
-        import os
-        
+        self.flush_saves()
         if not os.path.exists(filename):
-            return False
+            # Fall back to a save written before the MessagePack format
+            if filename == SAVE_FILE and os.path.exists(LEGACY_SAVE_FILE):
+                filename = LEGACY_SAVE_FILE
+            else:
+                return False
         
         try:
-            with open(filename, 'r') as f:
-                save_data = json.load(f)
+            with open(filename, 'rb') as f:
+                raw_data = f.read()
+            
+            # Sniff the format: JSON saves always start with an object
+            if raw_data[:1] == b'{':
+                save_data = orjson.loads(raw_data) if orjson is not None else json.loads(raw_data)
+            elif msgpack is not None:
+                save_data = msgpack.unpackb(raw_data, raw=False)
+            else:
+                print(f"Cannot load {filename}: msgpack is not installed")
+                return False
             
             print(f"Loading game from {filename}")
             
             # Check version for backward compatibility
             version = save_data.get("version", "1.0")
             
-            if version in ["2.0", "2.1"]:
+            if version in ["2.0", "2.1", "3.0", "3.1"]:
                 # New compact format
                 self.level = save_data["level"]
                 self.levels_completed = save_data["levels_completed"]
@@ -822,12 +983,7 @@ class GameState:
                 
                 # Reconstruct inventory from counts
                 inventory_counts = player_data["inventory"]
-                self.player.inventory = []
-                for item_type, count in inventory_counts.items():
-                    for _ in range(count):
-                        # Create dummy item for inventory
-                        dummy_item = type('Item', (), {'item_type': item_type})()
-                        self.player.inventory.append(dummy_item)
+                self.player.restore_inventory(inventory_counts)
                 
                 # Calculate derived stats from inventory
                 armor_count = inventory_counts.get("armor", 0)
@@ -865,12 +1021,12 @@ class GameState:
                 self.player.health = player_data["health"]
                 self.player.attack_power = player_data["attack_power"]
                 
-                # Restore player inventory (legacy format)
-                self.player.inventory = []
+                # Restore player inventory (legacy format stores one entry per item)
+                legacy_counts = {}
                 for item_data in player_data["inventory"]:
-                    # Create dummy loot item for inventory
-                    dummy_item = type('Item', (), item_data)()
-                    self.player.inventory.append(dummy_item)
+                    item_type = item_data["item_type"]
+                    legacy_counts[item_type] = legacy_counts.get(item_type, 0) + 1
+                self.player.restore_inventory(legacy_counts)
             
             # Clear existing entities
             self.monsters = []
@@ -917,8 +1073,7 @@ class GameState:
                 stairway_data = save_data["stairway"]
                 sprite = self.sprite_manager.get_sprite('stairway', 'stairway')
                 # Scale stairway sprite to be more prominent
-                scaled_size = int(TILE_SIZE * STAIRWAY_SCALE)
-                scaled_sprite = pygame.transform.scale(sprite, (scaled_size, scaled_size))
+                scaled_sprite = scale_sprite_for_stairway(sprite)
                 self.stairway = Stairway(stairway_data["x"], stairway_data["y"], scaled_sprite)
                 self.stairway.sprite_key = stairway_data.get("sprite_key", "stairway")
             
@@ -936,8 +1091,13 @@ class GameState:
                 self.death_sprites.append(death_sprite)
             
             # Load level snapshot if available (version 2.1+)
-            if version == "2.1" and "level_start_snapshot" in save_data:
-                self.level_start_snapshot = save_data["level_start_snapshot"]
+            snapshot_hash = save_data.get("level_start_snapshot_hash")
+            if snapshot_hash and os.path.exists(_snapshot_path(filename, snapshot_hash)):
+                # Version 3.1+: decode the sidecar lazily, only if the player retries
+                self._set_level_snapshot(None, snapshot_hash=snapshot_hash)
+                self._deferred_snapshot_path = _snapshot_path(filename, snapshot_hash)
+            elif version in ["2.1", "3.0"] and "level_start_snapshot" in save_data:
+                self._set_level_snapshot(save_data["level_start_snapshot"])
             else:
                 # For older saves, capture a snapshot of the current state
                 self._capture_level_snapshot()
@@ -947,7 +1107,6 @@ class GameState:
             
         except Exception as e:
             print(f"Failed to load game: {e}")
-            import traceback
             traceback.print_exc()
             return False
     
@@ -998,12 +1157,14 @@ class GameState:
     
     def reset_progress(self):
         """Reset all progress to start fresh (like a new game)."""
-        import os
-        
-        # Delete save file
-        if os.path.exists("savegame.json"):
-            os.remove("savegame.json")
-            print("Deleted save file")
+        # Don't let a queued save recreate the files deleted below
+        self.flush_saves()
+        # Delete save files (current and legacy JSON format)
+        for save_file in (SAVE_FILE, LEGACY_SAVE_FILE):
+            if os.path.exists(save_file):
+                os.remove(save_file)
+                print(f"Deleted save file {save_file}")
+            _remove_snapshot_files(save_file)
         
         # Reset to fresh state
         self.level = 1
@@ -1030,7 +1191,7 @@ class GameState:
         self.reset_confirmation_dialog = False
         
         # Clear level snapshot
-        self.level_start_snapshot = None
+        self._set_level_snapshot(None)
         
         # Reinitialize player with base stats
         self._initialize_player()
@@ -1042,21 +1203,14 @@ class GameState:
     
     def _regenerate_player_sprite(self):
         """Regenerate player sprite."""
-        import os
-        
         # Archive old sprite
         cache_path = "cache/sprites/player.png"
-        if os.path.exists(cache_path):
-            import time
-            archived_path = f"cache/sprites/player_archived_{int(time.time())}.png"
-            os.rename(cache_path, archived_path)
+        archived_path = f"cache/sprites/player_archived_{int(time.time())}.png"
+        if archive_cached_sprite(cache_path, archived_path):
             print(f"Archived player sprite to {archived_path}")
         
         # Remove from sprite manager (both sprites and placeholders)
-        if 'player' in self.sprite_manager.sprites:
-            del self.sprite_manager.sprites['player']
-        if 'player' in self.sprite_manager.placeholders:
-            del self.sprite_manager.placeholders['player']
+        self.sprite_manager.purge({'player'}, cache_paths=[cache_path])
         
         # Queue regeneration and set placeholder
         new_sprite = self.sprite_manager.get_sprite('player', 'player', priority=1)
@@ -1066,33 +1220,25 @@ class GameState:
     
     def _regenerate_monster_sprite(self, monster):
         """Regenerate monster sprite."""
-        import os
-        
         # Get monster cache info
         level = monster.level
         cache_path = f"cache/monsters/monster_level_{level}.png"
         
         # Archive old sprite
-        if os.path.exists(cache_path):
-            import time
-            archived_path = f"cache/monsters/monster_level_{level}_archived_{int(time.time())}.png"
-            os.rename(cache_path, archived_path)
+        archived_path = f"cache/monsters/monster_level_{level}_archived_{int(time.time())}.png"
+        if archive_cached_sprite(cache_path, archived_path):
             print(f"Archived monster sprite to {archived_path}")
         
         # Remove from sprite manager (both sprites and placeholders)
         monster_key = f"monster_level_{level}"
-        if monster_key in self.sprite_manager.sprites:
-            del self.sprite_manager.sprites[monster_key]
-        if monster_key in self.sprite_manager.placeholders:
-            del self.sprite_manager.placeholders[monster_key]
+        self.sprite_manager.purge({monster_key}, cache_paths=[cache_path])
         
         # Queue regeneration and set placeholder
         new_sprite, _ = self.sprite_manager.get_monster_data(monster_key)
         
         # Handle mini-boss scaling
         if monster.is_miniboss:
-            scaled_size = int(TILE_SIZE * 1.5)
-            monster.sprite = pygame.transform.scale(new_sprite, (scaled_size, scaled_size))
+            monster.sprite = scale_sprite_for_miniboss(new_sprite)
         else:
             monster.sprite = new_sprite
         
@@ -1100,26 +1246,19 @@ class GameState:
     
     def _regenerate_loot_sprite(self, loot_item):
         """Regenerate loot item sprite."""
-        import os
-        
         # Get loot cache info
         item_type = loot_item.item_type
         item_variant = getattr(loot_item, 'item_variant', item_type)
         cache_path = f"cache/items/item_{item_type}_{item_variant}.png"
         
         # Archive old sprite
-        if os.path.exists(cache_path):
-            import time
-            archived_path = f"cache/items/item_{item_type}_{item_variant}_archived_{int(time.time())}.png"
-            os.rename(cache_path, archived_path)
+        archived_path = f"cache/items/item_{item_type}_{item_variant}_archived_{int(time.time())}.png"
+        if archive_cached_sprite(cache_path, archived_path):
             print(f"Archived loot sprite to {archived_path}")
         
         # Remove from sprite manager (both sprites and placeholders)
         variant_key = f"item_{item_type}_{item_variant}"
-        if variant_key in self.sprite_manager.sprites:
-            del self.sprite_manager.sprites[variant_key]
-        if variant_key in self.sprite_manager.placeholders:
-            del self.sprite_manager.placeholders[variant_key]
+        self.sprite_manager.purge({variant_key}, cache_paths=[cache_path])
         
         # Queue regeneration and set placeholder
         cache_key = f"item_{item_type}_{item_variant}"
@@ -1131,21 +1270,14 @@ class GameState:
     
     def _regenerate_stairway_sprite(self):
         """Regenerate stairway sprite."""
-        import os
-        
         # Archive old sprite
         cache_path = "cache/sprites/stairway.png"
-        if os.path.exists(cache_path):
-            import time
-            archived_path = f"cache/sprites/stairway_archived_{int(time.time())}.png"
-            os.rename(cache_path, archived_path)
+        archived_path = f"cache/sprites/stairway_archived_{int(time.time())}.png"
+        if archive_cached_sprite(cache_path, archived_path):
             print(f"Archived stairway sprite to {archived_path}")
         
         # Remove from sprite manager (both sprites and placeholders)
-        if 'stairway' in self.sprite_manager.sprites:
-            del self.sprite_manager.sprites['stairway']
-        if 'stairway' in self.sprite_manager.placeholders:
-            del self.sprite_manager.placeholders['stairway']
+        self.sprite_manager.purge({'stairway'}, cache_paths=[cache_path])
         
         # Queue regeneration and set placeholder
         new_sprite = self.sprite_manager.get_sprite('stairway', 'stairway', priority=1)
@@ -1155,21 +1287,14 @@ class GameState:
     
     def _regenerate_death_sprite(self):
         """Regenerate death sprite."""
-        import os
-        
         # Archive old sprite
         cache_path = "cache/sprites/death.png"
-        if os.path.exists(cache_path):
-            import time
-            archived_path = f"cache/sprites/death_archived_{int(time.time())}.png"
-            os.rename(cache_path, archived_path)
+        archived_path = f"cache/sprites/death_archived_{int(time.time())}.png"
+        if archive_cached_sprite(cache_path, archived_path):
             print(f"Archived death sprite to {archived_path}")
         
         # Remove from sprite manager (both sprites and placeholders)
-        if 'death' in self.sprite_manager.sprites:
-            del self.sprite_manager.sprites['death']
-        if 'death' in self.sprite_manager.placeholders:
-            del self.sprite_manager.placeholders['death']
+        self.sprite_manager.purge({'death'}, cache_paths=[cache_path])
         
         # Queue regeneration and set placeholder for all death sprites
         new_sprite = self.sprite_manager.get_sprite('death', 'death', priority=1)
@@ -1177,8 +1302,7 @@ class GameState:
         # Update all current death sprites to use the new placeholder
         for death_sprite in self.death_sprites:
             if death_sprite.is_miniboss:
-                scaled_size = int(TILE_SIZE * DEATH_SPRITE_MINIBOSS_SCALE)
-                death_sprite.sprite = pygame.transform.scale(new_sprite, (scaled_size, scaled_size))
+                death_sprite.sprite = scale_sprite_for_death_miniboss(new_sprite)
             else:
                 death_sprite.sprite = new_sprite
         
@@ -1,10 +1,23 @@
 """Utility functions for image processing shared across sprite generation."""
 
+import os
+import weakref
 from io import BytesIO
-from PIL import Image
+from PIL import Image, ImageChops
 import pygame
 from constants import TILE_SIZE, MINIBOSS_SCALE_FACTOR, STAIRWAY_SCALE, DEATH_SPRITE_MINIBOSS_SCALE
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Pixels whose RGB sum falls below this are treated as background
+DARK_PIXEL_THRESHOLD = 30
+
+# Source sprite -> {size: scaled sprite}; entries vanish with their source
+_scaled_sprite_cache = weakref.WeakKeyDictionary()
+
 
 def process_generated_image(image_bytes, target_size=(32, 32)):
     """
@@ -31,23 +44,39 @@ def process_generated_image(image_bytes, target_size=(32, 32)):
     img = img.resize(target_size, Image.Resampling.NEAREST)
     
     # Convert dark background pixels to transparent
-    data = img.getdata()
-    new_data = []
-    for item in data:
-        # If pixel is very dark (RGB sum < 30), make it transparent
-        if item[0] + item[1] + item[2] < 30:
-            new_data.append((255, 255, 255, 0))  # Transparent
-        else:
-            new_data.append(item)
-    
-    img.putdata(new_data)
-    return img
+    if np is not None:
+        return _key_dark_pixels_numpy(img)
+    return _key_dark_pixels_pil(img)
+
+
+def _key_dark_pixels_numpy(img):
+    """Make very dark pixels transparent using a vectorized NumPy mask."""
+    pixels = np.array(img)  # HxWx4 uint8, writable copy
+    # View each RGBA pixel as one little-endian word (R in the low byte) so the
+    # key and the replacement are single 32-bit operations per pixel
+    packed = pixels.view('<u4')[..., 0]
+    rgb_sum = (packed & 0xFF) + ((packed >> 8) & 0xFF) + ((packed >> 16) & 0xFF)
+    packed[rgb_sum < DARK_PIXEL_THRESHOLD] = 0x00FFFFFF  # Transparent white
+    return Image.fromarray(pixels, "RGBA")
+
+
+def _key_dark_pixels_pil(img):
+    """Make very dark pixels transparent using Pillow's C band operations."""
+    r, g, b, _ = img.split()
+    # ImageChops.add clips at 255, which is fine for a threshold this low
+    rgb_sum = ImageChops.add(ImageChops.add(r, g), b)
+    keep_mask = rgb_sum.point(lambda v: 0 if v < DARK_PIXEL_THRESHOLD else 255)
+    transparent = Image.new("RGBA", img.size, (255, 255, 255, 0))
+    return Image.composite(img, transparent, keep_mask)
 
 
 def save_and_load_sprite(img, cache_path):
     """
     Save processed image to cache and load it as a pygame sprite.
     
+    The PNG is only written for the disk cache; the sprite itself is built
+    straight from the processed RGBA pixels, so nothing is decoded or read back.
+    
     Args:
         img: PIL Image object
         cache_path: Path to save the image
@@ -56,7 +85,86 @@ def save_and_load_sprite(img, cache_path):
         pygame.Surface sprite object
     """
     img.save(cache_path, "PNG")
-    return pygame.image.load(cache_path)
+    
+    # Keep the processed RGBA pixels next to the PNG so warm loads skip decoding
+    if np is not None:
+        try:
+            np.save(_pixel_cache_path(cache_path), np.asarray(img))
+        except OSError as e:
+            print(f"Error saving pixel cache for {cache_path}: {e}")
+    
+    return convert_for_display(pygame.image.frombuffer(img.tobytes(), img.size, 'RGBA'))
+
+
+def load_sprite(cache_path):
+    """
+    Load a cached sprite, preferring the raw RGBA .npy written alongside the PNG.
+    
+    Falls back to decoding the PNG directly with pygame (no PIL involved) for
+    sprites cached before the .npy sidecar existed or when NumPy is
+    unavailable, writing the missing sidecar so the next load skips the
+    decode. Either way the result is converted to the display format.
+    """
+    pixel_path = _pixel_cache_path(cache_path)
+    if np is not None and _pixel_cache_is_fresh(pixel_path, cache_path):
+        try:
+            pixels = np.load(pixel_path, mmap_mode='r')
+            height, width = pixels.shape[:2]
+            return convert_for_display(pygame.image.frombuffer(pixels.tobytes(), (width, height), 'RGBA'))
+        except (OSError, ValueError) as e:
+            print(f"Error loading pixel cache {pixel_path}: {e}")
+    
+    sprite = pygame.image.load(cache_path)
+    if np is not None:
+        try:
+            width, height = sprite.get_size()
+            pixels = np.frombuffer(pygame.image.tobytes(sprite, 'RGBA'), dtype=np.uint8)
+            np.save(pixel_path, pixels.reshape(height, width, 4))
+        except (OSError, ValueError) as e:
+            print(f"Error saving pixel cache for {cache_path}: {e}")
+    return convert_for_display(sprite)
+
+
+def _pixel_cache_path(cache_path):
+    """Path of the pre-processed RGBA pixel cache for a PNG cache path."""
+    return cache_path + '.npy'
+
+
+def _pixel_cache_is_fresh(pixel_path, cache_path):
+    """True if the pixel cache exists and is no older than the PNG it was built from."""
+    try:
+        return os.path.getmtime(pixel_path) >= os.path.getmtime(cache_path)
+    except OSError:
+        # Missing sidecar, or missing PNG (let the PNG load report that)
+        return False
+
+
+def archive_cached_sprite(cache_path, archived_path):
+    """
+    Move a cached sprite PNG aside and drop its pixel cache.
+    
+    Returns True if there was a PNG to archive.
+    """
+    try:
+        os.remove(_pixel_cache_path(cache_path))
+    except FileNotFoundError:
+        pass
+    try:
+        os.rename(cache_path, archived_path)
+    except FileNotFoundError:
+        return False
+    return True
+
+
+def convert_for_display(sprite):
+    """
+    Convert a sprite to the display's pixel format for fast alpha blits.
+    
+    Returns the sprite unchanged if no display mode has been set yet.
+    """
+    if pygame.display.get_surface() is None:
+        return sprite
+    return sprite.convert_alpha()
 
 
 def scale_sprite(sprite, scale_factor):
@@ -73,8 +181,24 @@ def scale_sprite(sprite, scale_factor):
     if scale_factor == 1.0:
         return sprite
     
-    scaled_size = int(TILE_SIZE * scale_factor)
-    return pygame.transform.scale(sprite, (scaled_size, scaled_size))
+    return scale_sprite_to_size(sprite, int(TILE_SIZE * scale_factor))
+
+
+def scale_sprite_to_size(sprite, size):
+    """
+    Scale a sprite to a square of the given size, reusing earlier results.
+    
+    Scaled surfaces are shared between callers, so they must not be modified
+    in place (copy first, as DeathSprite does before changing alpha).
+    """
+    sizes = _scaled_sprite_cache.get(sprite)
+    if sizes is None:
+        sizes = _scaled_sprite_cache[sprite] = {}
+    
+    scaled = sizes.get(size)
+    if scaled is None:
+        scaled = sizes[size] = pygame.transform.scale(sprite, (size, size))
+    return scaled
 
 
 def scale_sprite_for_miniboss(sprite):
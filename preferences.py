@@ -1,26 +1,179 @@
 """Player preferences and persistent progression system."""
 
+import atexit
 import json
+import logging
 import os
-from typing import Dict, List, Any
+import random
+import tempfile
+import threading
+import time
+from types import MappingProxyType
+from typing import Dict, List, Any, Mapping, Tuple
+
+from prompts import WEAPON_VARIANTS, ARMOR_VARIANTS, POTION_VARIANTS
+
+try:
+    import msgpack  # Compact binary preferences format
+except ImportError:
+    msgpack = None
+
+# Preferences are stored as MessagePack when available; older installs used JSON
+PREFERENCES_FILE = "preferences.msgpack"
+LEGACY_PREFERENCES_FILE = "preferences.json"
+
+# JSON preferences are written compactly unless PREFS_PRETTY is set for debugging
+PRETTY_JSON = bool(os.environ.get("PREFS_PRETTY"))
+
+# Buffer size for preferences file I/O
+IO_BUFFER_SIZE = 64 * 1024
+
+# Minimum seconds between routine preference writes; unlocks still save immediately
+SAVE_INTERVAL = 5.0
+
+# Stat deltas appended to the log before it is folded back into the main file
+COMPACT_EVERY = 100
+
+# Unlock order per item type, following the canonical variant prompts
+DEFAULT_VARIANT_DEFINITIONS = {
+    "weapon": list(WEAPON_VARIANTS),
+    "armor": list(ARMOR_VARIANTS),
+    "potion": list(POTION_VARIANTS),
+}
+
+# Routine variant bookkeeping is logged at debug level to keep stdout quiet during play
+logger = logging.getLogger(__name__)
+
+# (cache key, read-only params) per (item type, variant), shared by every queue request
+_VARIANT_REQUEST_CACHE: Dict[Tuple[str, str], Tuple[str, Mapping[str, str]]] = {}
+
+
+def _variant_request(item_type: str, variant: str) -> Tuple[str, Mapping[str, str]]:
+    """Return the sprite cache key and generation params for an item variant."""
+    request = _VARIANT_REQUEST_CACHE.get((item_type, variant))
+    if request is None:
+        params = MappingProxyType({'item_type': item_type, 'item_variant': variant})
+        request = _VARIANT_REQUEST_CACHE[(item_type, variant)] = (f"item_{item_type}_{variant}", params)
+    return request
 
 
 class PreferencesManager:
     """Manages player preferences and sprite variant unlocking progression."""
     
-    def __init__(self, preferences_file="preferences.json"):
+    def __init__(self, preferences_file=None):
+        if preferences_file is None:
+            preferences_file = PREFERENCES_FILE if msgpack is not None else LEGACY_PREFERENCES_FILE
         self.preferences_file = preferences_file
-        self.data = self._load_preferences()
+        self._use_msgpack = msgpack is not None and not preferences_file.endswith(".json")
+        # Lifetime stat changes are appended here as JSON lines between full saves
+        self.delta_log_file = os.path.splitext(preferences_file)[0] + ".jsonl"
+        self._pending_deltas = 0
+        # Loaded from disk on first access; see the data property
+        self._data = None
+        
+        # (item type, threshold key, lifetime stat) driving each unlock track
+        self._unlock_rules = [
+            ("weapon", "monsters_per_weapon", "total_monsters_killed"),
+            ("armor", "monsters_per_armor", "total_monsters_killed"),
+            ("potion", "levels_per_potion", "total_levels_completed"),
+        ]
+        # Stat value at which each item type unlocks its next variant
+        self._next_unlock: Dict[str, float] = {}
+        
+        # Per-item-type tuples of available variants for get_random_variant; cleared on change
+        self._available_tuples: Dict[str, tuple] = {}
+        # Membership sets mirroring the available_variants lists
+        self._available_sets: Dict[str, set] = {}
+        # get_progress_summary text, rebuilt after the next unlock
+        self._summary_cache = None
+        
+        # Routine stat updates are coalesced; see _save_if_due
+        self._dirty = False
+        self._last_save = 0.0
+        # Sprite worker threads mark variants available while the main thread updates stats;
+        # reentrant because the locked update paths end in save_preferences
+        self._lock = threading.RLock()
+        atexit.register(self.flush)
+    
+    @property
+    def data(self) -> Dict[str, Any]:
+        """Preferences data, loaded from disk the first time it is needed."""
+        if self._data is None:
+            with self._lock:
+                if self._data is None:
+                    data = self._load_preferences()
+                    self._available_sets = {t: set(vs) for t, vs in data["available_variants"].items()}
+                    self._data = data
+                    self._refresh_next_unlocks()
+        return self._data
     
     def _load_preferences(self) -> Dict[str, Any]:
+        """Load the preferences snapshot and replay any stat deltas logged since."""
+        data = self._load_snapshot()
+        self._replay_delta_log(data)
+        return data
+    
+    def _replay_delta_log(self, data: Dict[str, Any]):
+        """Apply logged lifetime stat deltas on top of the loaded snapshot."""
+        if not os.path.exists(self.delta_log_file):
+            return
+        
+        stats = data["lifetime_stats"]
+        try:
+            with open(self.delta_log_file, 'rb', buffering=IO_BUFFER_SIZE) as f:
+                for line in f:
+                    try:
+                        delta = json.loads(line)
+                    except (json.JSONDecodeError, UnicodeDecodeError):
+                        continue  # Skip a torn final line from an interrupted write
+                    # Skip deltas the snapshot already folded in (a crash can leave the log behind)
+                    seq = delta.pop("seq", None)
+                    if seq is not None:
+                        if seq <= data.get("delta_log_seq", 0):
+                            continue
+                        data["delta_log_seq"] = seq
+                    for stat_name, amount in delta.items():
+                        if stat_name in stats:
+                            stats[stat_name] += amount
+                    self._pending_deltas += 1
+        except IOError as e:
+            print(f"Error replaying preferences log: {e}")
+    
+    def _append_stat_delta(self, delta: Dict[str, int]):
+        """Append one lifetime stat change to the delta log."""
+        with self._lock:
+            seq = self.data.get("delta_log_seq", 0) + 1
+            try:
+                with open(self.delta_log_file, 'ab') as f:
+                    f.write(json.dumps({**delta, "seq": seq}).encode('utf-8') + b"\n")
+                self.data["delta_log_seq"] = seq
+                self._pending_deltas += 1
+            except IOError as e:
+                # Fall back to a full write so the change isn't lost
+                print(f"Error appending to preferences log: {e}")
+                self._dirty = True
+    
+    def _load_snapshot(self) -> Dict[str, Any]:
         """Load preferences from file, or create defaults if file doesn't exist."""
-        if os.path.exists(self.preferences_file):
+        path = self.preferences_file
+        if not os.path.exists(path) and path == PREFERENCES_FILE:
+            # Fall back to preferences written before the MessagePack format
+            path = LEGACY_PREFERENCES_FILE
+        
+        if os.path.exists(path):
             try:
-                with open(self.preferences_file, 'r') as f:
-                    data = json.load(f)
-                    # Migrate old format to new format
-                    return self._migrate_preferences(data)
-            except (json.JSONDecodeError, IOError) as e:
+                with open(path, 'rb', buffering=IO_BUFFER_SIZE) as f:
+                    raw_data = f.read()
+                # Sniff the format: JSON preferences always start with an object
+                if raw_data[:1] == b'{':
+                    data = json.loads(raw_data)
+                elif msgpack is not None:
+                    data = msgpack.unpackb(raw_data, raw=False)
+                else:
+                    raise IOError("msgpack is not installed")
+                # Migrate old format to new format
+                return self._migrate_preferences(data)
+            except (ValueError, IOError) as e:
                 print(f"Error loading preferences: {e}, using defaults")
         
         # Return default preferences
@@ -40,16 +193,14 @@ class PreferencesManager:
                 "armor": ["helmet"],
                 "potion": ["bottle"]
             },
-            "variant_definitions": {
-                "weapon": ["sword", "axe", "dagger", "mace", "spear", "bow", "hammer", "club", "scythe", "staff", "whip", "crossbow"],
-                "armor": ["helmet", "shield", "chestplate", "gauntlets", "boots", "bracers", "cloak", "vest", "pauldrons", "greaves", "belt", "mask"],
-                "potion": ["bottle", "vial", "flask", "orb", "crystal", "jar", "tube", "goblet", "chalice", "phial", "ampule", "beaker"]
-            },
+            "variant_definitions": {t: list(vs) for t, vs in DEFAULT_VARIANT_DEFINITIONS.items()},
             "unlock_thresholds": {
                 "monsters_per_weapon": 10,
                 "monsters_per_armor": 15,
                 "levels_per_potion": 3
-            }
+            },
+            # Sequence number of the last delta log entry folded into this snapshot
+            "delta_log_seq": 0
         }
     
     def _migrate_preferences(self, data: Dict[str, Any]) -> Dict[str, Any]:
@@ -67,11 +218,7 @@ class PreferencesManager:
         
         # Update variant_definitions to include new expanded variants
         current_definitions = data.get("variant_definitions", {})
-        new_definitions = {
-            "weapon": ["sword", "axe", "dagger", "mace", "spear", "bow", "hammer", "club", "scythe", "staff", "whip", "crossbow"],
-            "armor": ["helmet", "shield", "chestplate", "gauntlets", "boots", "bracers", "cloak", "vest", "pauldrons", "greaves", "belt", "mask"],
-            "potion": ["bottle", "vial", "flask", "orb", "crystal", "jar", "tube", "goblet", "chalice", "phial", "ampule", "beaker"]
-        }
+        new_definitions = DEFAULT_VARIANT_DEFINITIONS
         
         # Check if we need to update the definitions
         needs_update = False
@@ -82,18 +229,63 @@ class PreferencesManager:
                 break
         
         if needs_update:
-            data["variant_definitions"] = new_definitions
+            data["variant_definitions"] = {t: list(vs) for t, vs in new_definitions.items()}
             print("Updated variant definitions to include new expanded loot varieties")
         
         return data
     
     def save_preferences(self):
         """Save current preferences to file."""
-        try:
-            with open(self.preferences_file, 'w') as f:
-                json.dump(self.data, f, indent=2)
-        except IOError as e:
-            print(f"Error saving preferences: {e}")
+        with self._lock:
+            self._dirty = False
+            self._last_save = time.monotonic()
+            temp_path = None
+            try:
+                # Serialize first so the file is written in one call
+                if self._use_msgpack:
+                    data = msgpack.packb(self.data, use_bin_type=True)
+                else:
+                    if PRETTY_JSON:
+                        data = json.dumps(self.data, indent=2).encode('utf-8')
+                    else:
+                        data = json.dumps(self.data, separators=(',', ':')).encode('utf-8')
+                # Write a unique temp file beside the target and rename it over the old one
+                # so a crash never leaves it half-written
+                directory = os.path.dirname(os.path.abspath(self.preferences_file))
+                fd, temp_path = tempfile.mkstemp(
+                    dir=directory, prefix=os.path.basename(self.preferences_file) + ".", suffix=".tmp")
+                with os.fdopen(fd, 'wb', buffering=IO_BUFFER_SIZE) as f:
+                    f.write(data)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(temp_path, self.preferences_file)
+                temp_path = None
+                
+                # The snapshot now includes every logged delta, so start a fresh log
+                if self._pending_deltas:
+                    os.remove(self.delta_log_file)
+                    self._pending_deltas = 0
+            except IOError as e:
+                print(f"Error saving preferences: {e}")
+            finally:
+                if temp_path is not None:
+                    try:
+                        os.remove(temp_path)
+                    except OSError:
+                        pass
+    
+    def flush(self):
+        """Write preferences if there are unsaved changes or logged deltas (e.g. on shutdown)."""
+        with self._lock:
+            if self._data is not None and (self._dirty or self._pending_deltas):
+                self.save_preferences()
+    
+    def _save_if_due(self, important=False):
+        """Mark preferences dirty and write them only if important or the interval has passed."""
+        with self._lock:
+            self._dirty = True
+            if important or time.monotonic() - self._last_save > SAVE_INTERVAL:
+                self.save_preferences()
     
     def get_unlocked_variants(self, item_type: str) -> List[str]:
         """Get list of unlocked variants for given item type."""
@@ -105,71 +297,90 @@ class PreferencesManager:
     
     def get_random_variant(self, item_type: str) -> str:
         """Get a random available variant for the given item type."""
-        import random
-        variants = self.get_available_variants(item_type)
+        variants = self._available_tuples.get(item_type)
+        if variants is None:
+            variants = self._available_tuples[item_type] = tuple(self.get_available_variants(item_type))
         return random.choice(variants) if variants else item_type
     
     def update_game_stats(self, monsters_killed: int = 0, levels_completed: int = 0, game_finished: bool = False, sprite_manager=None):
         """Update lifetime statistics and check for new unlocks."""
-        stats = self.data["lifetime_stats"]
-        
-        # Update stats
-        stats["total_monsters_killed"] += monsters_killed
-        stats["total_levels_completed"] += levels_completed
-        if game_finished:
-            stats["games_played"] += 1
-        
-        # Check for new unlocks
-        newly_unlocked = self._check_unlocks()
-        
-        # Pre-generate sprites for newly unlocked variants
-        if newly_unlocked and sprite_manager:
-            self._queue_variant_generation(newly_unlocked, sprite_manager)
+        with self._lock:
+            stats = self.data["lifetime_stats"]
+            
+            # Update stats
+            stats["total_monsters_killed"] += monsters_killed
+            stats["total_levels_completed"] += levels_completed
+            if game_finished:
+                stats["games_played"] += 1
+            
+            # Check for new unlocks
+            newly_unlocked = self._check_unlocks()
+            
+            # Unlocks rewrite the whole file; routine stat changes just append a delta
+            if newly_unlocked or self._pending_deltas >= COMPACT_EVERY:
+                self.save_preferences()
+            else:
+                delta = {
+                    "total_monsters_killed": monsters_killed,
+                    "total_levels_completed": levels_completed,
+                    "games_played": 1 if game_finished else 0,
+                }
+                delta = {k: v for k, v in delta.items() if v}
+                if delta:
+                    self._append_stat_delta(delta)
         
-        # Save after updates
-        self.save_preferences()
+        # Pre-generate sprites for newly unlocked variants (outside the lock, since
+        # the sprite manager takes its own)
+        if newly_unlocked:
+            print(f"Unlocked: {', '.join(newly_unlocked)}")
+            if sprite_manager:
+                self._queue_variant_generation(newly_unlocked, sprite_manager)
         
         return newly_unlocked
     
+    def _refresh_next_unlocks(self):
+        """Recompute the stat value each item type needs for its next unlock."""
+        thresholds = self.data["unlock_thresholds"]
+        unlocked = self.data["unlocked_variants"]
+        definitions = self.data["variant_definitions"]
+        
+        for item_type, threshold_key, _ in self._unlock_rules:
+            current_count = len(unlocked[item_type])
+            if current_count < len(definitions[item_type]):
+                self._next_unlock[item_type] = current_count * thresholds[threshold_key]
+            else:
+                self._next_unlock[item_type] = float('inf')
+    
     def _check_unlocks(self) -> List[str]:
         """Check if any new variants should be unlocked based on current stats."""
-        newly_unlocked = []
         stats = self.data["lifetime_stats"]
+        next_unlock = self._next_unlock
+        
+        # Common case: no track has reached its next threshold yet
+        if all(stats[stat_key] < next_unlock[item_type] for item_type, _, stat_key in self._unlock_rules):
+            return []
+        
+        newly_unlocked = []
         thresholds = self.data["unlock_thresholds"]
         unlocked = self.data["unlocked_variants"]
         definitions = self.data["variant_definitions"]
         
-        # Check weapon unlocks (based on monsters killed)
-        monsters_killed = stats["total_monsters_killed"]
-        weapon_unlocks_earned = monsters_killed // thresholds["monsters_per_weapon"]
-        current_weapon_count = len(unlocked["weapon"])
-        available_weapons = definitions["weapon"]
-        
-        if weapon_unlocks_earned > current_weapon_count - 1 and current_weapon_count < len(available_weapons):
-            new_weapon = available_weapons[current_weapon_count]
-            unlocked["weapon"].append(new_weapon)
-            newly_unlocked.append(f"weapon_{new_weapon}")
-        
-        # Check armor unlocks (based on monsters killed, slower rate)
-        armor_unlocks_earned = monsters_killed // thresholds["monsters_per_armor"]
-        current_armor_count = len(unlocked["armor"])
-        available_armor = definitions["armor"]
-        
-        if armor_unlocks_earned > current_armor_count - 1 and current_armor_count < len(available_armor):
-            new_armor = available_armor[current_armor_count]
-            unlocked["armor"].append(new_armor)
-            newly_unlocked.append(f"armor_{new_armor}")
-        
-        # Check potion unlocks (based on levels completed)
-        levels_completed = stats["total_levels_completed"]
-        potion_unlocks_earned = levels_completed // thresholds["levels_per_potion"]
-        current_potion_count = len(unlocked["potion"])
-        available_potions = definitions["potion"]
-        
-        if potion_unlocks_earned > current_potion_count - 1 and current_potion_count < len(available_potions):
-            new_potion = available_potions[current_potion_count]
-            unlocked["potion"].append(new_potion)
-            newly_unlocked.append(f"potion_{new_potion}")
+        # At most one new variant per item type per check
+        for item_type, threshold_key, stat_key in self._unlock_rules:
+            earned = stats[stat_key] // thresholds[threshold_key]
+            unlocked_of_type = unlocked[item_type]
+            available_of_type = definitions[item_type]
+            current_count = len(unlocked_of_type)
+            
+            if earned > current_count - 1 and current_count < len(available_of_type):
+                new_variant = available_of_type[current_count]
+                unlocked_of_type.append(new_variant)
+                newly_unlocked.append(f"{item_type}_{new_variant}")
+        
+        if newly_unlocked:
+            self._available_tuples.clear()
+            self._summary_cache = None
+            self._refresh_next_unlocks()
         
         return newly_unlocked
     
@@ -181,11 +392,11 @@ class PreferencesManager:
                 item_type, variant = variant_name.split('_', 1)
                 
                 # Queue generation with high priority for immediate feedback
-                cache_key = f"item_{item_type}_{variant}"
-                params = {'item_type': item_type, 'item_variant': variant}
+                cache_key, params = _variant_request(item_type, variant)
                 sprite_manager.get_sprite(cache_key, 'item', params, priority=1)
-                
-                print(f"Queued generation for {variant_name}")
+        
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Queued generation for {', '.join(newly_unlocked)}")
     
     def queue_initial_variants(self, sprite_manager):
         """Queue generation for all currently unlocked variants on game start."""
@@ -193,56 +404,69 @@ class PreferencesManager:
         
         for item_type, variants in unlocked.items():
             for variant in variants:
-                cache_key = f"item_{item_type}_{variant}"
-                params = {'item_type': item_type, 'item_variant': variant}
+                cache_key, params = _variant_request(item_type, variant)
                 
                 # Lower priority for initial generation to not block other sprites
                 sprite_manager.get_sprite(cache_key, 'item', params, priority=3)
                 
-        print(f"Queued initial variant generation: {sum(len(v) for v in unlocked.values())} variants")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Queued initial variant generation: {sum(len(v) for v in unlocked.values())} variants")
     
     def mark_variant_available(self, item_type: str, variant: str) -> bool:
         """Mark a variant as available (sprite ready) and return True if it was newly available."""
-        available = self.data.get("available_variants", {})
-        if item_type not in available:
-            available[item_type] = []
-        
-        if variant not in available[item_type]:
-            available[item_type].append(variant)
-            self.save_preferences()
-            print(f"Variant {item_type}_{variant} is now available!")
-            return True
-        return False
+        with self._lock:
+            available = self.data["available_variants"]
+            available_set = self._available_sets.setdefault(item_type, set())
+            if variant in available_set:
+                return False
+            available_set.add(variant)
+            available.setdefault(item_type, []).append(variant)
+            self._available_tuples.pop(item_type, None)
+            self._save_if_due()
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Variant {item_type}_{variant} is now available!")
+        return True
     
     def sync_available_with_existing_sprites(self, sprite_manager):
         """Sync available variants with existing cached sprites on startup."""
-        import os
         newly_available = []
         
+        # One directory scan instead of a stat() per variant
+        try:
+            with os.scandir("cache/items") as entries:
+                existing = {entry.name for entry in entries if entry.is_file()}
+        except FileNotFoundError:
+            existing = set()
+        
         unlocked = self.data.get("unlocked_variants", {})
         available = self.data.get("available_variants", {})
         
         for item_type, variants in unlocked.items():
             if item_type not in available:
                 available[item_type] = []
+            available_set = self._available_sets.setdefault(item_type, set())
             
             for variant in variants:
-                if variant not in available[item_type]:
+                if variant not in available_set:
                     # Check if sprite exists on disk
-                    cache_path = f"cache/items/item_{item_type}_{variant}.png"
-                    if os.path.exists(cache_path):
+                    if f"item_{item_type}_{variant}.png" in existing:
                         available[item_type].append(variant)
+                        available_set.add(variant)
                         newly_available.append(f"{item_type}_{variant}")
         
         if newly_available:
+            self._available_tuples.clear()
             self.save_preferences()
-            print(f"Synced {len(newly_available)} existing sprites to available variants")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Synced {len(newly_available)} existing sprites to available variants")
         
         return newly_available
     
     def get_progress_summary(self) -> str:
         """Get a summary of current unlock progress."""
-        stats = self.data["lifetime_stats"]
+        if self._summary_cache is not None:
+            return self._summary_cache
+        
         unlocked = self.data["unlocked_variants"]
         definitions = self.data["variant_definitions"]
         
@@ -250,4 +474,5 @@ class PreferencesManager:
         armor_progress = f"{len(unlocked['armor'])}/{len(definitions['armor'])} armor"
         potion_progress = f"{len(unlocked['potion'])}/{len(definitions['potion'])} potions"
         
-        return f"Unlocked: {weapon_progress}, {armor_progress}, {potion_progress}"
\ No newline at end of file
+        self._summary_cache = f"Unlocked: {weapon_progress}, {armor_progress}, {potion_progress}"
+        return self._summary_cache
\ No newline at end of file
@@ -1,5 +1,7 @@
 # Prompt constants for AI generation
 
+from types import MappingProxyType
+
 PLAYER_SPRITE_PROMPT = "Basic human figure with sword"
 MONSTER_SPRITE_PROMPT = "Simple monster creature, basic shape"
 STAIRWAY_SPRITE_PROMPT = "Simple stone steps going down"
@@ -63,6 +65,17 @@ SPRITE_STYLE = (
     "Must be recognizable in under 16x16 pixels, minimal and iconic only."
 )
 
+# Variant tables are read-only lookups shared by the sprite worker threads
+WEAPON_VARIANTS = MappingProxyType(WEAPON_VARIANTS)
+ARMOR_VARIANTS = MappingProxyType(ARMOR_VARIANTS)
+POTION_VARIANTS = MappingProxyType(POTION_VARIANTS)
+
+# Complete image prompts per item type and variant, styled once at import
+ITEM_VARIANT_PROMPTS = MappingProxyType({
+    item_type: MappingProxyType({name: f"{desc}. {SPRITE_STYLE}" for name, desc in variants.items()})
+    for item_type, variants in (("weapon", WEAPON_VARIANTS), ("armor", ARMOR_VARIANTS), ("potion", POTION_VARIANTS))
+})
+
 MONSTER_STATS_SYSTEM_PROMPT = "You are a dungeon monster generator."
 MONSTER_STATS_USER_PROMPT = "Generate stats for a level {level} monster."
 
@@ -1,32 +1,145 @@
 """Rendering system for drawing all game entities and UI."""
 
+from collections import OrderedDict
+
 import pygame
 from constants import *
+from image_utils import convert_for_display
+
+# Maximum number of rendered text surfaces kept by RenderSystem._render_text
+TEXT_CACHE_SIZE = 256
+
+# Above this many dirty rectangles a full flip is cheaper than a partial update
+DIRTY_RECT_LIMIT = 50
+
+# Default-font sizes used by the HUD, overlays and monster level indicators
+COMMON_FONT_SIZES = (16, 20, 24, 28, 36, 42, 72)
+
+# Effect circle states, indexing the (color, alpha) tables below
+EFFECT_READY, EFFECT_COOLDOWN, EFFECT_ATTACKED, EFFECT_DAMAGED = range(4)
+
+# Player: light green when ready, dark gray on cooldown, cyan after hitting, red after being hit
+PLAYER_EFFECTS = ((GREEN, 50), (DARK_GRAY, 60), (CYAN, 100), (RED, 100))
+# Monster: ready uses threat colors (see _add_monster_effect); white flash is visible against them
+MONSTER_EFFECTS = (None, (DARK_GRAY, 60), (CYAN, 100), (WHITE, 120))
+
+# Ready monsters between "very weak" and "one-shot" threat blend from gray to red in this many steps
+THREAT_SHADES = 8
+MONSTER_THREAT_EFFECTS = tuple(
+    (tuple(int(g + (r - g) * step / (THREAT_SHADES - 1)) for g, r in zip(GRAY, RED)),
+     60 + int(20 * step / (THREAT_SHADES - 1)))  # Alpha 60-80
+    for step in range(THREAT_SHADES)
+)
+
+# (radius, color, alpha) of every effect circle entities can show, all drawn at startup
+COMMON_EFFECT_CIRCLES = (
+    [(int(PLAYER_ATTACK_RANGE), color, alpha) for color, alpha in PLAYER_EFFECTS] +
+    [(int(MONSTER_ATTACK_RANGE), color, alpha)
+     for color, alpha in MONSTER_EFFECTS[1:] + MONSTER_THREAT_EFFECTS +
+                         (((255, 0, 255), 90), (RED, 80), (GRAY, 60), (DARK_GRAY, 35))]
+)
+
+# Entity types the regeneration dialog can be opened for (see Game._handle_mouse_click)
+REGENERATION_TYPES = ('player', 'monster', 'loot', 'stairway', 'death')
+
+# Shared default-font instances by point size; see _font
+_FONT_CACHE = {}
+
+
+def _font(size):
+    """Return the shared default font at the given size, creating it on first use."""
+    font = _FONT_CACHE.get(size)
+    if font is None:
+        font = pygame.font.Font(None, size)
+        _FONT_CACHE[size] = font
+    return font
 
 
 class RenderSystem:
-    """Handles all rendering of game entities and UI."""
+    """
+    Handles all rendering of game entities and UI.
+    
+    Every surface blitted here is expected to already be in the display's pixel
+    format (see image_utils.convert_for_display); surfaces built by the renderer
+    itself are converted once when they are cached.
+    """
     
     def __init__(self, screen):
         self.screen = screen
-        self.font = pygame.font.Font(None, 36)
-        self.small_font = pygame.font.Font(None, 24)
+        self._screen_rect = screen.get_rect()
+        # Batched blit that skips building return rects; pygame-ce's fblits is the faster path
+        fblits = getattr(screen, 'fblits', None)
+        self._blit_batch = fblits if fblits else (lambda sequence: screen.blits(sequence, doreturn=0))
+        # Load every font the render path needs up front instead of mid-frame
+        for size in COMMON_FONT_SIZES:
+            _font(size)
+        self.font = _font(36)
+        self.small_font = _font(24)
+        # Rendered text surfaces keyed by (font, text, color), least recently used first
+        self._text_cache = OrderedDict()
+        # Signature of the last frozen (paused / game over) frame that was presented
+        self._last_frame_sig = None
+        # Screen areas drawn this frame and last frame, for partial display updates
+        self._dirty_rects = []
+        self._prev_dirty_rects = []
+        self._needs_full_flip = True
+        # Static overlay backgrounds keyed by overlay name; see _cached_overlay
+        self._overlay_cache = {}
+        self._prebuild_overlays()
+        # (source sprite, 2x scaled copy) shown in the regeneration dialog
+        self._regen_sprite_cache = (None, None)
+        # Solid health bar segments keyed by (width, color)
+        self._bar_cache = {}
+        # Monster level badges keyed by (level, font size, text color, background color)
+        self._badge_cache = {}
+        # Effect circle surfaces keyed by (radius, color, alpha)
+        self._circle_cache = {}
+        for radius, color, alpha in COMMON_EFFECT_CIRCLES:
+            self._get_circle(radius, color, alpha)
+    
+    def invalidate(self):
+        """Force the next frame to be fully redrawn and presented (e.g. after the window is uncovered)."""
+        self._needs_full_flip = True
+        self._last_frame_sig = None
+    
+    def _render_text(self, font, text, color):
+        """Render text with antialiasing, reusing the surface if it was rendered recently."""
+        key = (font, text, color)
+        surface = self._text_cache.get(key)
+        if surface is None:
+            surface = convert_for_display(font.render(text, True, color))
+            self._text_cache[key] = surface
+            if len(self._text_cache) > TEXT_CACHE_SIZE:
+                self._text_cache.popitem(last=False)
+        else:
+            self._text_cache.move_to_end(key)
+        return surface
     
     def render_game(self, game_state):
         """Render the complete game state."""
-        # Store game state for access in rendering methods
-        self._current_game_state = game_state
+        # The world doesn't update while paused or after game over, so once that
+        # frame is on screen, skip redrawing and flipping until something visible changes
+        if game_state.paused or game_state.game_over:
+            frame_sig = self._frozen_frame_signature(game_state)
+            if frame_sig == self._last_frame_sig:
+                return
+            self._last_frame_sig = frame_sig
+        else:
+            self._last_frame_sig = None
         
-        # Always render the game world
+        # Render the game world, recording which screen areas get drawn
+        self._dirty_rects = []
         self.screen.fill(BACKGROUND_COLOR)
-        self._render_player(game_state.player)
-        self._render_monsters(game_state.monsters)
+        now = pygame.time.get_ticks()
+        self._render_player(game_state.player, now)
+        self._render_monsters(game_state.monsters, game_state.player, now)
         self._render_loot(game_state.loot_items)
         self._render_stairway(game_state.stairway)
         self._render_death_sprites(game_state.death_sprites)
         self._render_ui(game_state)
         
         # Render overlays on top
+        overlay_active = True
         if game_state.regeneration_dialog:
             self._render_regeneration_dialog(game_state)
         elif game_state.reset_confirmation_dialog:
@@ -35,14 +148,62 @@ class RenderSystem:
             self._render_paused_overlay()
         elif game_state.game_over:
             self._render_game_over_overlay(game_state)
-            
-        pygame.display.flip()
+        else:
+            overlay_active = False
+        
+        # Present only what changed since last frame: what was drawn then (now erased)
+        # and what is drawn now. Overlays cover the whole screen, so they always flip.
+        update_rects = self._prev_dirty_rects + self._dirty_rects
+        if overlay_active or self._needs_full_flip or len(update_rects) > DIRTY_RECT_LIMIT:
+            pygame.display.flip()
+        else:
+            pygame.display.update(update_rects)
+        # Leaving an overlay needs one full flip to uncover the whole screen
+        self._needs_full_flip = overlay_active
+        self._prev_dirty_rects = self._dirty_rects
+    
+    def _frozen_frame_signature(self, game_state):
+        """Summarize everything that can change on screen while the world is frozen."""
+        entity = game_state.regeneration_entity
+        sprite_status = game_state.sprite_manager.get_status()
+        return (
+            game_state.paused,
+            game_state.game_over,
+            game_state.regeneration_dialog,
+            game_state.regeneration_type,
+            id(entity.sprite) if entity else None,
+            game_state.reset_confirmation_dialog,
+            sprite_status['active'],
+            sprite_status['pending'],
+        )
+    
+    @staticmethod
+    def _sprite_size(entity):
+        """Return an entity's (width, height), falling back to one tile when it has no sprite."""
+        sprite = entity.sprite
+        return sprite.get_size() if sprite else (TILE_SIZE, TILE_SIZE)
     
-    def _render_player(self, player):
+    def _entity_dirty_rect(self, entity, size, radius):
+        """Screen area covered by an entity's sprite, health bar, level indicator and effect circle."""
+        width, height = size
+        # Health bars sit up to 15px above the sprite; the player's can be HEALTH_BAR_WIDTH wide
+        rect = pygame.Rect(entity.x, entity.y - 15, max(width, HEALTH_BAR_WIDTH), height + 15)
+        if entity.sprite:
+            center_x = entity.x + width // 2
+            center_y = entity.y + height // 2
+            rect.union_ip((center_x - radius, center_y - radius, radius * 2, radius * 2))
+        return rect.inflate(2, 2)  # Cover fractional positions
+    
+    def _render_player(self, player, now):
         """Render the player sprite and effects."""
         if player.sprite:
+            size = player.sprite.get_size()
+            self._dirty_rects.append(self._entity_dirty_rect(player, size, int(player.attack_range)))
+            
             # Draw effect circle behind sprite
-            self._render_entity_effect_circle(player, player.x, player.y, player.sprite)
+            effect = []
+            self._add_player_effect(effect, player, size, now)
+            self.screen.blits(effect, doreturn=0)
             
             # Draw sprite
             self.screen.blit(player.sprite, (player.x, player.y))
@@ -50,144 +211,145 @@ class RenderSystem:
             # Draw health bar
             self._render_player_health_bar(player)
     
-    def _render_monsters(self, monsters):
+    def _render_monsters(self, monsters, player, now):
         """Render all monsters and their effects."""
-        for monster in monsters:
-            if not monster.is_alive:
-                continue
-                
-            # Draw effect circle behind sprite
-            self._render_entity_effect_circle(monster, monster.x, monster.y, monster.sprite)
-            
-            # Draw sprite
-            if monster.sprite:
-                self.screen.blit(monster.sprite, (monster.x, monster.y))
-            
-            # Draw health bar and level indicator
-            self._render_monster_health_bar(monster)
-            self._render_monster_level_indicator(monster)
+        alive_monsters = [monster for monster in monsters if monster.is_alive]
+        # Look up each sprite's size once per frame and share it with every helper below
+        sprite_size = self._sprite_size
+        sizes = [sprite_size(monster) for monster in alive_monsters]
+        entity_dirty_rect = self._entity_dirty_rect
+        radius = int(MONSTER_ATTACK_RANGE)
+        self._dirty_rects.extend(entity_dirty_rect(monster, size, radius)
+                                 for monster, size in zip(alive_monsters, sizes))
+        
+        # Draw effect circles behind all sprites in one call; threat colors depend on the player's health
+        player_health = player.health if player else None
+        effects = []
+        add_effect = self._add_monster_effect
+        for monster, size in zip(alive_monsters, sizes):
+            add_effect(effects, monster, size, now, player_health)
+        self.screen.blits(effects, doreturn=0)
+        
+        # Draw sprites in one batched call
+        self._blit_batch([(monster.sprite, (monster.x, monster.y))
+                          for monster in alive_monsters if monster.sprite])
+        
+        # Draw health bars and level indicators on top
+        health_bars = []
+        add_health_bar = self._add_monster_health_bar
+        for monster, (width, _) in zip(alive_monsters, sizes):
+            add_health_bar(health_bars, monster, width)
+        self._blit_batch(health_bars)
+        
+        badges = []
+        add_level_indicator = self._add_monster_level_indicator
+        for monster, (width, _) in zip(alive_monsters, sizes):
+            add_level_indicator(badges, monster, monster.get_render_info(), width)
+        self._blit_batch(badges)
     
     def _render_loot(self, loot_items):
         """Render all loot items."""
-        for loot_item in loot_items:
-            if loot_item.sprite:
-                self.screen.blit(loot_item.sprite, (loot_item.x, loot_item.y))
+        self._dirty_rects.extend(self.screen.blits([(loot_item.sprite, (loot_item.x, loot_item.y))
+                                                    for loot_item in loot_items if loot_item.sprite]))
     
     def _render_stairway(self, stairway):
         """Render the stairway if it exists."""
         if stairway and stairway.sprite:
-            self.screen.blit(stairway.sprite, (stairway.x, stairway.y))
+            self._dirty_rects.append(self.screen.blit(stairway.sprite, (stairway.x, stairway.y)))
     
     def _render_death_sprites(self, death_sprites):
         """Render all death sprites with fade effect."""
+        batch = []
         for death_sprite in death_sprites:
             # Use faded sprite if available, otherwise use regular sprite
             sprite_to_render = death_sprite.faded_sprite if death_sprite.faded_sprite else death_sprite.sprite
             if sprite_to_render:
-                self.screen.blit(sprite_to_render, (death_sprite.x, death_sprite.y))
+                batch.append((sprite_to_render, (death_sprite.x, death_sprite.y)))
+        self._dirty_rects.extend(self.screen.blits(batch))
     
-    def _render_entity_effect_circle(self, entity, x, y, sprite):
-        """Render standardized effect circle for any entity."""
-        if not sprite:
+    def _get_circle(self, radius, color, alpha):
+        """Return a translucent filled circle surface with pre-multiplied alpha, drawing it only the first time.
+        
+        Blit the result with special_flags=pygame.BLEND_PREMULTIPLIED.
+        """
+        key = (radius, color, alpha)
+        surface = self._circle_cache.get(key)
+        if surface is None:
+            surface = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+            premultiplied = tuple(c * alpha // 255 for c in color)
+            pygame.draw.circle(surface, (*premultiplied, alpha), (radius, radius), radius)
+            surface = convert_for_display(surface)
+            self._circle_cache[key] = surface
+        return surface
+    
+    @staticmethod
+    def _effect_state(entity, now, cooldown):
+        """Return the entity's EFFECT_* state, or None if its idle ring is hidden."""
+        if entity.damage_flash_timer > 0:
+            return EFFECT_DAMAGED
+        if entity.attack_flash_timer > 0:
+            return EFFECT_ATTACKED
+        if not SHOW_IDLE_EFFECT_RINGS:
+            return None
+        return EFFECT_READY if now - entity.last_attack_time >= cooldown else EFFECT_COOLDOWN
+    
+    def _add_player_effect(self, batch, player, size, now):
+        """Append the player's effect circle to a blits() batch; now is this frame's tick count."""
+        state = self._effect_state(player, now, PLAYER_ATTACK_COOLDOWN)
+        if state is None:
             return
-            
-        sprite_w = sprite.get_width()
-        sprite_h = sprite.get_height()
-        center_x = x + sprite_w // 2
-        center_y = y + sprite_h // 2
-        
-        # Circle radius based on entity's attack range
-        if hasattr(entity, 'attack_range'):  # Player
-            radius = int(entity.attack_range)
-        else:  # Monster
-            radius = int(MONSTER_ATTACK_RANGE)
         
-        circle_size = radius * 2
+        color, alpha = PLAYER_EFFECTS[state]
+        self._add_effect_circle(batch, player.x, player.y, size, int(player.attack_range), color, alpha)
+    
+    def _add_monster_effect(self, batch, monster, size, now, player_current_health):
+        """Append a monster's effect circle to a blits() batch; now is this frame's tick count."""
+        if not monster.sprite:
+            return
         
-        # Determine effect color and alpha based on entity state
-        color = None
-        alpha = 0
+        state = self._effect_state(monster, now, MONSTER_ATTACK_COOLDOWN)
+        if state is None:
+            return
         
-        if entity.damage_flash_timer > 0:
-            # Red flash for player, white flash for monsters (visible against threat colors)
-            if hasattr(entity, 'attack_power'):  # Player
-                color = RED
-                alpha = 100
-            else:  # Monster
-                color = WHITE
-                alpha = 120
-        elif entity.attack_flash_timer > 0:
-            # Cyan: Entity just dealt damage
-            color = CYAN
-            alpha = 100
+        if state != EFFECT_READY:
+            color, alpha = MONSTER_EFFECTS[state]
         else:
-            # Check attack readiness
-            current_time = pygame.time.get_ticks()
-            if hasattr(entity, 'last_attack_time'):
-                if hasattr(entity, 'attack_power'):  # Player
-                    cooldown = PLAYER_ATTACK_COOLDOWN
-                else:  # Monster
-                    cooldown = MONSTER_ATTACK_COOLDOWN
+            # Ready to attack: use threat-based colors from the player's current health
+            if player_current_health is not None:
+                threat_ratio = monster.damage / player_current_health if player_current_health > 0 else 1.0
                 
-                time_since_attack = current_time - entity.last_attack_time
-                can_attack = time_since_attack >= cooldown
-                
-                if can_attack:
-                    # For monsters, use threat-based colors when ready to attack
-                    if hasattr(entity, 'damage'):  # Monster
-                        # Get player's current health from game state
-                        game_state = getattr(self, '_current_game_state', None)
-                        if game_state and game_state.player:
-                            player_current_health = game_state.player.health
-                            threat_ratio = entity.damage / player_current_health if player_current_health > 0 else 1.0
-                            
-                            if hasattr(entity, 'level') and entity.level > player_current_health:
-                                # Magenta: Monster level exceeds player's current health (extreme danger)
-                                color = (255, 0, 255)  # Magenta
-                                alpha = 90
-                            elif threat_ratio >= 1.0:
-                                # Full red: Can one-shot the player
-                                color = RED
-                                alpha = 80
-                            elif threat_ratio <= 0.05:
-                                # Gray: Very weak monster (5% or less of player health)
-                                color = GRAY  # Use lighter gray for better visibility
-                                alpha = 60
-                            else:
-                                # Interpolate between gray and red based on threat level
-                                # threat_ratio is between 0.05 and 1.0
-                                # Normalize to 0-1 range for interpolation
-                                normalized_threat = (threat_ratio - 0.05) / 0.95
-                                
-                                # Interpolate RGB values
-                                gray_r, gray_g, gray_b = GRAY  # Use lighter gray
-                                red_r, red_g, red_b = RED
-                                
-                                interp_r = int(gray_r + (red_r - gray_r) * normalized_threat)
-                                interp_g = int(gray_g + (red_g - gray_g) * normalized_threat)
-                                interp_b = int(gray_b + (red_b - gray_b) * normalized_threat)
-                                
-                                color = (interp_r, interp_g, interp_b)
-                                alpha = 60 + int(20 * normalized_threat)  # Alpha 60-80
-                        else:
-                            # Fallback if no game state available
-                            color = DARK_GRAY
-                            alpha = 35
-                    else:  # Player
-                        # Light green: Ready to attack (subtle)
-                        color = GREEN
-                        alpha = 50
+                if monster.level > player_current_health:
+                    # Magenta: Monster level exceeds player's current health (extreme danger)
+                    color, alpha = (255, 0, 255), 90
+                elif threat_ratio >= 1.0:
+                    # Full red: Can one-shot the player
+                    color, alpha = RED, 80
+                elif threat_ratio <= 0.05:
+                    # Gray: Very weak monster (5% or less of player health)
+                    color, alpha = GRAY, 60
                 else:
-                    # Dark gray: Attack cooldown
-                    color = DARK_GRAY
-                    alpha = 60
+                    # Blend between gray and red based on threat level
+                    # threat_ratio is between 0.05 and 1.0; normalize to 0-1 and pick the nearest shade
+                    normalized_threat = (threat_ratio - 0.05) / 0.95
+                    color, alpha = MONSTER_THREAT_EFFECTS[round(normalized_threat * (THREAT_SHADES - 1))]
+            else:
+                # Fallback if there is no player
+                color, alpha = DARK_GRAY, 35
+        
+        self._add_effect_circle(batch, monster.x, monster.y, size, int(MONSTER_ATTACK_RANGE), color, alpha)
+    
+    def _add_effect_circle(self, batch, x, y, size, radius, color, alpha):
+        """Append an effect circle centered on a sprite of the given size drawn at (x, y) to a blits() batch."""
+        width, height = size
+        center_x = x + width // 2
+        center_y = y + height // 2
+        
+        # Cull circles that lie entirely off screen
+        if not self._screen_rect.colliderect((center_x - radius, center_y - radius, radius * 2, radius * 2)):
+            return
         
-        # Draw the circle if we have a color
-        if color and alpha > 0:
-            flash_surface = pygame.Surface((circle_size, circle_size), pygame.SRCALPHA)
-            pygame.draw.circle(flash_surface, (*color, alpha), (radius, radius), radius)
-            flash_rect = flash_surface.get_rect(center=(center_x, center_y))
-            self.screen.blit(flash_surface, flash_rect)
+        flash_surface = self._get_circle(radius, color, alpha)
+        batch.append((flash_surface, (center_x - radius, center_y - radius), None, pygame.BLEND_PREMULTIPLIED))
     
     def _render_player_health_bar(self, player):
         """Render health bar for the player with bonus health in cyan."""
@@ -195,123 +357,148 @@ class RenderSystem:
         max_health = player.get_max_health()
         current_health = player.health
         
-        # Draw background (red)
-        pygame.draw.rect(self.screen, RED, 
-                       (x, y - 10, HEALTH_BAR_WIDTH, HEALTH_BAR_HEIGHT))
+        # Background (red); segments share the cached bar surfaces with the monsters
+        bars = [(self._get_bar(HEALTH_BAR_WIDTH, RED), (x, y - 10))]
         
         if current_health > 0:
             if current_health <= max_health:
                 # Normal health (green)
-                health_ratio = current_health / max_health
-                pygame.draw.rect(self.screen, GREEN, 
-                               (x, y - 10, 
-                                HEALTH_BAR_WIDTH * health_ratio, 
-                                HEALTH_BAR_HEIGHT))
+                health_width = int(HEALTH_BAR_WIDTH * current_health / max_health)
+                if health_width > 0:
+                    bars.append((self._get_bar(health_width, GREEN), (x, y - 10)))
             else:
                 # Player has bonus health beyond max
-                # Draw max health portion (green)
-                pygame.draw.rect(self.screen, GREEN, 
-                               (x, y - 10, HEALTH_BAR_WIDTH, HEALTH_BAR_HEIGHT))
+                # Max health portion (green)
+                bars.append((self._get_bar(HEALTH_BAR_WIDTH, GREEN), (x, y - 10)))
                 
-                # Draw bonus health portion (cyan) - extends beyond normal bar
+                # Bonus health portion (cyan) - extends beyond normal bar
                 bonus_health = current_health - max_health
                 bonus_ratio = bonus_health / max_health  # Bonus relative to max health
-                bonus_width = min(HEALTH_BAR_WIDTH * bonus_ratio, HEALTH_BAR_WIDTH)  # Cap at bar width
-                
-                pygame.draw.rect(self.screen, CYAN, 
-                               (x, y - 15, bonus_width, HEALTH_BAR_HEIGHT))
-    
-    def _render_monster_health_bar(self, monster):
-        """Render health bar for a monster."""
-        x, y = monster.x, monster.y
-        bar_width = monster.sprite.get_width() if monster.sprite else TILE_SIZE
-
-        # Draw background (red)
-        pygame.draw.rect(self.screen, RED,
-                       (x, y - 10, bar_width, HEALTH_BAR_HEIGHT))
-        # Draw health (green)
-        pygame.draw.rect(self.screen, GREEN,
-                       (x, y - 10,
-                        bar_width * monster.get_health_ratio(),
-                        HEALTH_BAR_HEIGHT))
-    
-    def _render_monster_level_indicator(self, monster):
-        """Render level number on monster to show difficulty."""
-        # Get render info for this monster
-        render_info = monster.get_render_info()
+                bonus_width = int(min(HEALTH_BAR_WIDTH * bonus_ratio, HEALTH_BAR_WIDTH))  # Cap at bar width
+                if bonus_width > 0:
+                    bars.append((self._get_bar(bonus_width, CYAN), (x, y - 15)))
         
+        self._blit_batch(bars)
+    
+    def _get_bar(self, width, color):
+        """Return a solid health bar segment of the given width, filling it only the first time."""
+        key = (width, color)
+        bar = self._bar_cache.get(key)
+        if bar is None:
+            bar = pygame.Surface((width, HEALTH_BAR_HEIGHT))
+            bar.fill(color)
+            self._bar_cache[key] = bar
+        return bar
+    
+    def _add_monster_health_bar(self, batch, monster, bar_width):
+        """Append a monster's health bar segments, bar_width wide, to a blits() batch."""
+        position = (monster.x, monster.y - 10)
+        
+        # Background (red)
+        batch.append((self._get_bar(bar_width, RED), position))
+        # Health (green)
+        health_width = int(bar_width * monster.get_health_ratio())
+        if health_width > 0:
+            batch.append((self._get_bar(health_width, GREEN), position))
+    
+    def _add_monster_level_indicator(self, batch, monster, render_info, sprite_w):
+        """Append a monster's level badge to a blits() batch to show difficulty."""
         # Skip rendering if level indicator should not be shown
         if not render_info.show_level_indicator:
             return
         
-        # Create font and text
-        font = pygame.font.Font(None, render_info.font_size)
-        level_text = font.render(str(render_info.level), True, render_info.level_text_color)
-
-        # Position in top-right corner of monster
-        sprite_w = monster.sprite.get_width() if monster.sprite else TILE_SIZE
-        text_rect = level_text.get_rect()
-        text_x = monster.x + sprite_w - text_rect.width - render_info.level_indicator_offset_x
-        text_y = monster.y - render_info.level_indicator_offset_y
-
-        # Create translucent surface for background
-        bg_size = max(text_rect.width + 4, text_rect.height + 4)
-        bg_surface = pygame.Surface((bg_size, bg_size), pygame.SRCALPHA)
-        
-        # Draw translucent background circle
-        pygame.draw.circle(bg_surface, render_info.bg_color, (bg_size//2, bg_size//2), bg_size//2)
+        badge, text_width = self._get_level_badge(render_info)
         
-        # Blit background and text
-        self.screen.blit(bg_surface, (text_x - 2, text_y - 2))
-        self.screen.blit(level_text, (text_x, text_y))
+        # Position the text in the top-right corner of the monster; the badge starts 2px above-left
+        text_x = monster.x + sprite_w - text_width - render_info.level_indicator_offset_x
+        text_y = monster.y - render_info.level_indicator_offset_y
+        batch.append((badge, (text_x - 2, text_y - 2)))
+    
+    def _get_level_badge(self, render_info):
+        """Return (badge surface, text width) for a level number, composing it only the first time."""
+        key = (render_info.level, render_info.font_size, render_info.level_text_color, render_info.bg_color)
+        cached = self._badge_cache.get(key)
+        if cached is None:
+            font = _font(render_info.font_size)
+            level_text = font.render(str(render_info.level), True, render_info.level_text_color)
+            text_rect = level_text.get_rect()
+            
+            # Translucent background circle behind the number, both offset by the 2px margin
+            radius = max(text_rect.width + 4, text_rect.height + 4) // 2
+            badge = pygame.Surface((max(radius * 2, text_rect.width + 2), max(radius * 2, text_rect.height + 2)),
+                                   pygame.SRCALPHA)
+            pygame.draw.circle(badge, render_info.bg_color, (radius, radius), radius)
+            badge.blit(level_text, (2, 2))
+            
+            cached = (convert_for_display(badge), text_rect.width)
+            self._badge_cache[key] = cached
+        return cached
     
     def _render_ui(self, game_state):
         """Render user interface elements."""
         player = game_state.player
+        render_text = self._render_text
         
         # Level display (playthrough-level format)
         playthrough = game_state.deaths + 1
-        level_text = self.font.render(f"Level: {playthrough}-{game_state.level}", True, WHITE)
-        self.screen.blit(level_text, (10, 10))
-        
-        # Prowess (monster levels defeated)
-        prowess_text = self.small_font.render(f"Prowess: {game_state.monster_levels_defeated}", True, (200, 200, 200))
-        self.screen.blit(prowess_text, (10, 50))
-        
-        # Player stats
-        health_text = self.small_font.render(f"Health: {player.health}/{player.get_max_health()}", True, (255, 100, 100))
-        self.screen.blit(health_text, (10, 75))
-        
-        attack_text = self.small_font.render(f"Attack: {player.attack_power:.2f}", True, (100, 255, 100))
-        self.screen.blit(attack_text, (10, 100))
+        hud = [
+            (render_text(self.font, f"Level: {playthrough}-{game_state.level}", WHITE), (10, 10)),
+            # Prowess (monster levels defeated)
+            (render_text(self.small_font, f"Prowess: {game_state.monster_levels_defeated}", (200, 200, 200)), (10, 50)),
+            # Player stats
+            (render_text(self.small_font, f"Health: {player.health}/{player.get_max_health()}", (255, 100, 100)), (10, 75)),
+            (render_text(self.small_font, f"Attack: {player.attack_power:.2f}", (100, 255, 100)), (10, 100)),
+        ]
         
         # Message display
         if game_state.message_timer > 0:
-            message_text = self.font.render(game_state.message, True, YELLOW)
-            self.screen.blit(message_text, (WINDOW_WIDTH // 2 - 100, WINDOW_HEIGHT // 2 - 50))
+            message_text = render_text(self.font, game_state.message, YELLOW)
+            hud.append((message_text, (WINDOW_WIDTH // 2 - 100, WINDOW_HEIGHT // 2 - 50)))
         
         # Sprite generation status (if any pending)
         sprite_status = game_state.sprite_manager.get_status()
         if sprite_status['pending'] > 0 or sprite_status['active'] > 0:
             status_text = f"Generating sprites: {sprite_status['active']} active, {sprite_status['pending']} pending"
-            status_surface = self.small_font.render(status_text, True, (150, 150, 255))
-            self.screen.blit(status_surface, (10, WINDOW_HEIGHT - 25))
+            hud.append((render_text(self.small_font, status_text, (150, 150, 255)), (10, WINDOW_HEIGHT - 25)))
+        
+        self._dirty_rects.extend(self.screen.blits(hud))
     
     # Loading screen rendering removed - using background generation with placeholders
     
+    def _cached_overlay(self, key, build, *args):
+        """Return the static overlay surface for key, calling build(*args) the first time."""
+        overlay = self._overlay_cache.get(key)
+        if overlay is None:
+            overlay = convert_for_display(build(*args))
+            self._overlay_cache[key] = overlay
+        return overlay
+    
+    def _prebuild_overlays(self):
+        """Bake every constant overlay at startup so opening a dialog never stalls a frame."""
+        self._cached_overlay('paused', self._build_paused_overlay)
+        self._cached_overlay('reset', self._build_reset_confirmation_dialog)
+        self._cached_overlay('game_over', self._build_game_over_overlay)
+        for regeneration_type in REGENERATION_TYPES:
+            self._cached_overlay(('regeneration', regeneration_type),
+                                 self._build_regeneration_dialog, regeneration_type)
+    
     def _render_paused_overlay(self):
         """Render a transparent overlay with pause menu options."""
+        self.screen.blit(self._cached_overlay('paused', self._build_paused_overlay), (0, 0))
+    
+    def _build_paused_overlay(self):
+        """Build the pause menu overlay."""
         overlay = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT), pygame.SRCALPHA)
         overlay.fill((0, 0, 0, 120))  # Semi-transparent black
         
         # Title
-        title_font = pygame.font.Font(None, 72)
-        pause_text = title_font.render("Paused", True, WHITE)
+        title_font = _font(72)
+        pause_text = self._render_text(title_font, "Paused", WHITE)
         title_rect = pause_text.get_rect(center=(WINDOW_WIDTH // 2, WINDOW_HEIGHT // 2 - 80))
         overlay.blit(pause_text, title_rect)
         
         # Menu options
-        menu_font = pygame.font.Font(None, 36)
+        menu_font = _font(36)
         options = [
             "Press SPACE to Resume",
             "Press Q to Quit (saves game)",
@@ -319,14 +506,33 @@ class RenderSystem:
         ]
         
         for i, option in enumerate(options):
-            option_surface = menu_font.render(option, True, WHITE)
+            option_surface = self._render_text(menu_font, option, WHITE)
             option_rect = option_surface.get_rect(center=(WINDOW_WIDTH // 2, WINDOW_HEIGHT // 2 - 10 + i * 40))
             overlay.blit(option_surface, option_rect)
         
-        self.screen.blit(overlay, (0, 0))
+        return overlay
     
     def _render_regeneration_dialog(self, game_state):
         """Render the sprite regeneration dialog."""
+        regeneration_type = game_state.regeneration_type
+        overlay = self._cached_overlay(('regeneration', regeneration_type),
+                                       self._build_regeneration_dialog, regeneration_type)
+        self.screen.blit(overlay, (0, 0))
+        
+        # Show the sprite being regenerated at 2x size
+        entity = game_state.regeneration_entity
+        if entity and entity.sprite:
+            source, sprite_2x = self._regen_sprite_cache
+            if source is not entity.sprite:
+                sprite_2x = pygame.transform.scale(entity.sprite, (entity.sprite.get_width() * 2, entity.sprite.get_height() * 2))
+                sprite_2x = convert_for_display(sprite_2x)
+                self._regen_sprite_cache = (entity.sprite, sprite_2x)
+            dialog_y = (WINDOW_HEIGHT - 200) // 2  # Same box as _build_regeneration_dialog
+            sprite_rect = sprite_2x.get_rect(center=(WINDOW_WIDTH // 2, dialog_y + 100))
+            self.screen.blit(sprite_2x, sprite_rect)
+    
+    def _build_regeneration_dialog(self, regeneration_type):
+        """Build the regeneration dialog background and text for a sprite type."""
         # Create translucent overlay
         overlay = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT), pygame.SRCALPHA)
         overlay.fill((0, 0, 0, 120))  # Semi-transparent black
@@ -343,30 +549,27 @@ class RenderSystem:
         pygame.draw.rect(overlay, WHITE, dialog_rect, 3)
         
         # Title
-        title_font = pygame.font.Font(None, 36)
-        title_text = f"Regenerate {game_state.regeneration_type.title()} Sprite?"
-        title_surface = title_font.render(title_text, True, WHITE)
+        title_font = _font(36)
+        title_text = f"Regenerate {regeneration_type.title()} Sprite?"
+        title_surface = self._render_text(title_font, title_text, WHITE)
         title_rect = title_surface.get_rect(center=(WINDOW_WIDTH // 2, dialog_y + 35))
         overlay.blit(title_surface, title_rect)
         
-        # Show the sprite being regenerated at 2x size
-        entity = game_state.regeneration_entity
-        if entity and entity.sprite:
-            sprite_2x = pygame.transform.scale(entity.sprite, (entity.sprite.get_width() * 2, entity.sprite.get_height() * 2))
-            sprite_rect = sprite_2x.get_rect(center=(WINDOW_WIDTH // 2, dialog_y + 100))
-            overlay.blit(sprite_2x, sprite_rect)
-        
         # Instructions at bottom
-        instruction_font = pygame.font.Font(None, 24)
+        instruction_font = _font(24)
         instruction_text = "Press R to Regenerate  |  Press ESC to Cancel"
-        instruction_surface = instruction_font.render(instruction_text, True, WHITE)
+        instruction_surface = self._render_text(instruction_font, instruction_text, WHITE)
         instruction_rect = instruction_surface.get_rect(center=(WINDOW_WIDTH // 2, dialog_y + 165))
         overlay.blit(instruction_surface, instruction_rect)
         
-        self.screen.blit(overlay, (0, 0))
+        return overlay
     
     def _render_reset_confirmation_dialog(self):
         """Render the reset confirmation dialog."""
+        self.screen.blit(self._cached_overlay('reset', self._build_reset_confirmation_dialog), (0, 0))
+    
+    def _build_reset_confirmation_dialog(self):
+        """Build the reset confirmation dialog overlay."""
         # Create translucent overlay
         overlay = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT), pygame.SRCALPHA)
         overlay.fill((0, 0, 0, 150))  # Darker overlay for important dialog
@@ -383,39 +586,32 @@ class RenderSystem:
         pygame.draw.rect(overlay, WHITE, dialog_rect, 3)
         
         # Title
-        title_font = pygame.font.Font(None, 42)
+        title_font = _font(42)
         title_text = "Reset Progress?"
-        title_surface = title_font.render(title_text, True, WHITE)
+        title_surface = self._render_text(title_font, title_text, WHITE)
         title_rect = title_surface.get_rect(center=(WINDOW_WIDTH // 2, dialog_y + 40))
         overlay.blit(title_surface, title_rect)
         
         # Warning text
-        warning_font = pygame.font.Font(None, 28)
+        warning_font = _font(28)
         warning_text = "This will delete your save and start completely fresh!"
-        warning_surface = warning_font.render(warning_text, True, (255, 200, 200))  # Light red
+        warning_surface = self._render_text(warning_font, warning_text, (255, 200, 200))  # Light red
         warning_rect = warning_surface.get_rect(center=(WINDOW_WIDTH // 2, dialog_y + 80))
         overlay.blit(warning_surface, warning_rect)
         
         # Instructions
-        instruction_font = pygame.font.Font(None, 24)
+        instruction_font = _font(24)
         instruction_text = "Press Y to Reset  |  Press ESC to Cancel"
-        instruction_surface = instruction_font.render(instruction_text, True, WHITE)
+        instruction_surface = self._render_text(instruction_font, instruction_text, WHITE)
         instruction_rect = instruction_surface.get_rect(center=(WINDOW_WIDTH // 2, dialog_y + 130))
         overlay.blit(instruction_surface, instruction_rect)
         
-        self.screen.blit(overlay, (0, 0))
+        return overlay
     
     def _render_game_over_overlay(self, game_state):
         """Render the game over overlay with stats and restart option."""
-        # Create translucent overlay
-        overlay = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 150))  # Semi-transparent black
-        
-        # Title
-        title_font = pygame.font.Font(None, 72)
-        title_text = title_font.render("GAME OVER", True, RED)
-        title_rect = title_text.get_rect(center=(WINDOW_WIDTH // 2, 150))
-        overlay.blit(title_text, title_rect)
+        # Static background and title; the live stats are drawn on top
+        self.screen.blit(self._cached_overlay('game_over', self._build_game_over_overlay), (0, 0))
         
         # Statistics
         stats_y = 250
@@ -432,11 +628,13 @@ class RenderSystem:
             f"Inventory Items: {len(game_state.player.inventory)}" if game_state.player else ""
         ]
         
+        # Collect all text and submit it in one blits() call
+        text_blits = []
         for i, stat in enumerate(stats):
             if stat:  # Skip empty strings
-                stat_text = self.font.render(stat, True, WHITE)
+                stat_text = self._render_text(self.font, stat, WHITE)
                 stat_rect = stat_text.get_rect(center=(WINDOW_WIDTH // 2, stats_y + i * line_height))
-                overlay.blit(stat_text, stat_rect)
+                text_blits.append((stat_text, stat_rect))
         
         # Instructions
         instructions_y = stats_y + len([s for s in stats if s]) * line_height + 60
@@ -446,16 +644,29 @@ class RenderSystem:
         
         # Primary instruction
         if legacy_loot > 0:
-            instruction_text = self.font.render(f"Press R to retry level or SPACE to start over with {legacy_loot} loot", True, YELLOW)
+            instruction_text = self._render_text(self.font, f"Press R to retry level or SPACE to start over with {legacy_loot} loot", YELLOW)
         else:
-            instruction_text = self.font.render("Press R to retry level or SPACE to start over", True, YELLOW)
+            instruction_text = self._render_text(self.font, "Press R to retry level or SPACE to start over", YELLOW)
         instruction_rect = instruction_text.get_rect(center=(WINDOW_WIDTH // 2, instructions_y))
-        overlay.blit(instruction_text, instruction_rect)
+        text_blits.append((instruction_text, instruction_rect))
         
         # Secondary instruction
-        quit_text = self.small_font.render("Press ESC to quit", True, (200, 200, 200))
+        quit_text = self._render_text(self.small_font, "Press ESC to quit", (200, 200, 200))
         quit_rect = quit_text.get_rect(center=(WINDOW_WIDTH // 2, instructions_y + 35))
-        overlay.blit(quit_text, quit_rect)
+        text_blits.append((quit_text, quit_rect))
+        
+        self._blit_batch(text_blits)
+    
+    def _build_game_over_overlay(self):
+        """Build the game over background and title."""
+        # Create translucent overlay
+        overlay = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT), pygame.SRCALPHA)
+        overlay.fill((0, 0, 0, 150))  # Semi-transparent black
+        
+        # Title
+        title_font = _font(72)
+        title_text = self._render_text(title_font, "GAME OVER", RED)
+        title_rect = title_text.get_rect(center=(WINDOW_WIDTH // 2, 150))
+        overlay.blit(title_text, title_rect)
         
-        # Blit the overlay to the screen
-        self.screen.blit(overlay, (0, 0))
\ No newline at end of file
+        return overlay
\ No newline at end of file
@@ -1,12 +1,31 @@
 """Sprite management system with background generation and placeholders."""
 
+import os
 import threading
-import queue
+import traceback
 import pygame
-from collections import defaultdict
+from collections import defaultdict, deque
 import time
-from constants import TILE_SIZE
-from image_utils import process_generated_image, save_and_load_sprite
+from constants import TILE_SIZE, STAIRWAY_SCALE, CACHE_SPRITES_DIR, CACHE_MONSTERS_DIR, CACHE_ITEMS_DIR
+from prompts import ITEM_VARIANT_PROMPTS, SPRITE_STYLE
+from image_utils import (
+    process_generated_image,
+    save_and_load_sprite,
+    load_sprite,
+    convert_for_display,
+    scale_sprite_for_miniboss,
+    scale_sprite_for_stairway,
+)
+
+# Number of generation priority levels; get_sprite() clamps priorities into range
+GENERATION_PRIORITIES = 10
+
+# Extra workers are added while the backlog exceeds two requests per worker, up to this many
+MAX_GENERATION_WORKERS = 8
+# Seconds an extra worker waits without a request before exiting
+WORKER_IDLE_EXIT = 30
+# Average generation time above which the API is treated as throttled and no workers are added
+SLOW_GENERATION_SECONDS = 20
 
 
 class SpriteManager:
@@ -27,17 +46,27 @@ class SpriteManager:
     
     def __init__(self, sprite_generator, max_concurrent=3):
         self.sprite_generator = sprite_generator
-        self.max_concurrent = max_concurrent
+        self.max_concurrent = max_concurrent  # Baseline worker count, kept alive at all times
+        self.max_workers = max(max_concurrent, MAX_GENERATION_WORKERS)
         
-        # Sprite storage
+        # Sprite storage. Single-key reads and writes are atomic under the GIL and
+        # workers only store finished sprites, so readers use these dicts without
+        # generation_lock; the lock only guards compound updates and the counters.
         self.sprites = {}  # key -> sprite mapping
+        self.monster_stats = {}  # monster key -> stats description
+        self.item_types = {}  # key -> item type picked for randomly generated items
         self.placeholders = {}  # key -> placeholder sprite
+        self._placeholder_fonts = {}  # font size -> default font for placeholder labels
+        self._placeholder_surfaces = {}  # (sprite_type, label key) -> shared placeholder surface
         
         # Background generation
-        self.generation_queue = queue.PriorityQueue()
+        # One FIFO per priority (lower number = sooner), all guarded by generation_lock
+        self._generation_queues = [deque() for _ in range(GENERATION_PRIORITIES)]
         self.active_generations = set()
         self.generation_lock = threading.Lock()
+        self._work_available = threading.Condition(self.generation_lock)
         self.workers = []
+        self._recent_latencies = deque(maxlen=16)  # Seconds taken by recent generations
         
         # Statistics
         self.pending_count = 0
@@ -46,6 +75,27 @@ class SpriteManager:
         # Completion callbacks
         self.completion_callbacks = []
         
+        # Generation handler per sprite type; see _generation_worker
+        self._generators = {
+            'player': self._generate_player,
+            'monster': self._generate_monster,
+            'item': self._generate_item,
+            'stairway': self._generate_stairway,
+            'death': self._generate_death,
+        }
+        
+        # Disk cache path per sprite type; fixed sprites map straight to their file
+        self._cache_path_resolvers = {
+            'player': lambda key, params: "cache/sprites/player.png",
+            'monster': self._monster_cache_path,
+            'item': self._item_cache_path,
+            'stairway': lambda key, params: "cache/sprites/stairway.png",
+            'death': lambda key, params: "cache/sprites/death.png",
+        }
+        
+        # Paths of files in the disk cache, so lookups don't stat() on the main thread
+        self._disk_index = self._scan_disk_cache()
+        
         # Start worker threads
         self._start_workers()
         
@@ -67,91 +117,139 @@ class SpriteManager:
     def _start_workers(self):
         """Start background worker threads for sprite generation."""
         for i in range(self.max_concurrent):
-            worker = threading.Thread(target=self._generation_worker, daemon=True)
-            worker.start()
-            self.workers.append(worker)
+            self._spawn_worker()
+    
+    def _spawn_worker(self):
+        """Start one more worker thread."""
+        worker = threading.Thread(target=self._generation_worker, daemon=True)
+        worker.start()
+        self.workers.append(worker)
+    
+    def _scale_workers(self):
+        """Add a worker if the backlog outgrows the pool; caller holds generation_lock."""
+        if len(self.workers) >= self.max_workers or self._queue_size() <= 2 * len(self.workers):
+            return
+        latencies = self._recent_latencies
+        if latencies and sum(latencies) / len(latencies) > SLOW_GENERATION_SECONDS:
+            return  # More concurrent requests would only queue up behind a throttled API
+        self._spawn_worker()
+    
+    def _retire_if_extra(self):
+        """Drop the calling worker from the pool if it is above the baseline; True if it should exit."""
+        with self.generation_lock:
+            if len(self.workers) <= self.max_concurrent:
+                return False
+            self.workers.remove(threading.current_thread())
+            return True
     
     def _generation_worker(self):
         """Worker thread that processes sprite generation queue."""
+        last_request = time.monotonic()
         while True:
+            # Get next request (waits up to a second if the queue is empty)
+            request = self._next_request()
+            if request is None:
+                if time.monotonic() - last_request >= WORKER_IDLE_EXIT and self._retire_if_extra():
+                    return
+                continue
+            key, sprite_type, params = request
+            last_request = time.monotonic()
+            
+            with self.generation_lock:
+                if key in self.sprites:
+                    # Already generated, skip
+                    continue
+                self.active_generations.add(key)
+            
+            # Generate sprite with the handler for its type
+            started = time.monotonic()
             try:
-                # Get next item from queue (blocks if empty)
-                priority, key, sprite_type, params = self.generation_queue.get(timeout=1)
-                
-                with self.generation_lock:
-                    if key in self.sprites:
-                        # Already generated, skip
-                        self.generation_queue.task_done()
-                        continue
-                    self.active_generations.add(key)
-                
-                # Generate sprite based on type
-                try:
-                    if sprite_type == 'player':
-                        sprite = self.sprite_generator.generate_player_sprite()
-                    elif sprite_type == 'monster':
-                        level = params['level']
-                        sprite, stats = self.sprite_generator.generate_monster_sprite_and_stats(level)
-                        # Store both sprite and stats
-                        self.sprites[f"{key}_stats"] = stats
-                    elif sprite_type == 'item':
-                        # Use specific item type if provided, otherwise generate random
-                        import os
-                        item_type = params.get('item_type') if params else None
-                        if item_type:
-                            # Generate sprite for specific item type and variant using consistent cache path
-                            item_variant = params.get('item_variant', item_type)
-                            cache_path = f"cache/items/item_{item_type}_{item_variant}.png"
-                            if os.path.exists(cache_path):
-                                sprite = pygame.image.load(cache_path)
-                            else:
-                                from prompts import WEAPON_VARIANTS, ARMOR_VARIANTS, POTION_VARIANTS, SPRITE_STYLE
-                                
-                                # Use variant-specific prompts if available
-                                item_variant = params.get('item_variant', item_type)
-                                if item_type == 'weapon':
-                                    prompt = WEAPON_VARIANTS.get(item_variant, f"Simple {item_variant} weapon")
-                                elif item_type == 'armor':
-                                    prompt = ARMOR_VARIANTS.get(item_variant, f"Simple {item_variant} armor")
-                                else:  # potion
-                                    prompt = POTION_VARIANTS.get(item_variant, f"Simple {item_variant} potion")
-                                    
-                                image_bytes = self.sprite_generator.client.generate_image(f"{prompt}. {SPRITE_STYLE}")
-                                
-                                # Process the image using shared utility
-                                img = process_generated_image(image_bytes)
-                                sprite = save_and_load_sprite(img, cache_path)
-                        else:
-                            sprite, item_type = self.sprite_generator.generate_item_sprite()
-                            self.sprites[f"{key}_type"] = item_type
-                    elif sprite_type == 'stairway':
-                        sprite = self.sprite_generator.generate_stairway_sprite()
-                    elif sprite_type == 'death':
-                        sprite = self.sprite_generator.generate_death_sprite()
-                    else:
-                        sprite = None
-                    
-                    if sprite:
-                        with self.generation_lock:
-                            self.sprites[key] = sprite
-                            self.completed_count += 1
-                            self.pending_count = max(0, self.pending_count - 1)
-                        
-                        # Notify completion callbacks
-                        self._notify_completion(key, sprite_type, params)
-                
-                except Exception as e:
-                    print(f"Error generating sprite {key}: {e}")
-                    import traceback
-                    traceback.print_exc()
+                generate = self._generators.get(sprite_type)
+                sprite = generate(key, params) if generate else None
                 
-                finally:
+                if sprite:
+                    self._recent_latencies.append(time.monotonic() - started)
+                    cache_path = self._cache_path(key, sprite_type, params)
                     with self.generation_lock:
-                        self.active_generations.discard(key)
-                    self.generation_queue.task_done()
+                        if cache_path:
+                            self._disk_index.add(cache_path)
+                        self.sprites[key] = sprite
+                        self.completed_count += 1
+                        self.pending_count = max(0, self.pending_count - 1)
                     
-            except queue.Empty:
-                continue
+                    # Notify completion callbacks
+                    self._notify_completion(key, sprite_type, params)
+            
+            except Exception as e:
+                print(f"Error generating sprite {key}: {e}")
+                traceback.print_exc()
+            
+            finally:
+                with self.generation_lock:
+                    self.active_generations.discard(key)
+    
+    def _generate_player(self, key, params):
+        """Generate the player sprite."""
+        return self.sprite_generator.generate_player_sprite()
+    
+    def _generate_monster(self, key, params):
+        """Generate a monster sprite, keeping its stats for get_monster_data()."""
+        sprite, stats = self.sprite_generator.generate_monster_sprite_and_stats(params['level'])
+        self.monster_stats[key] = stats
+        return sprite
+    
+    def _generate_item(self, key, params):
+        """Generate an item sprite for a specific type and variant, or a random item if none is given."""
+        item_type = params.get('item_type') if params else None
+        if not item_type:
+            sprite, item_type = self.sprite_generator.generate_item_sprite()
+            self.item_types[key] = item_type
+            return sprite
+        
+        # Generate sprite for specific item type and variant using consistent cache path
+        item_variant = params.get('item_variant', item_type)
+        cache_path = f"cache/items/item_{item_type}_{item_variant}.png"
+        if cache_path in self._disk_index:
+            return load_sprite(cache_path)
+        
+        # Use the pre-styled variant prompt if available
+        prompt = ITEM_VARIANT_PROMPTS.get(item_type, {}).get(item_variant)
+        if prompt is None:
+            prompt = f"Simple {item_variant} {item_type}. {SPRITE_STYLE}"
+        
+        image_bytes = self.sprite_generator.client.generate_image(prompt)
+        
+        # Process the image using shared utility
+        img = process_generated_image(image_bytes)
+        return save_and_load_sprite(img, cache_path)
+    
+    def _generate_stairway(self, key, params):
+        """Generate the stairway sprite."""
+        return self.sprite_generator.generate_stairway_sprite()
+    
+    def _generate_death(self, key, params):
+        """Generate the death sprite."""
+        return self.sprite_generator.generate_death_sprite()
+    
+    def _next_request(self):
+        """Pop the most urgent queued request, waiting briefly for one; None if none arrived."""
+        with self._work_available:
+            request = self._pop_request()
+            if request is None:
+                self._work_available.wait(timeout=1)
+                request = self._pop_request()
+            return request
+    
+    def _pop_request(self):
+        """Pop the oldest request of the lowest priority number; caller holds generation_lock."""
+        for requests in self._generation_queues:
+            if requests:
+                return requests.popleft()
+        return None
+    
+    def _queue_size(self):
+        """Number of queued requests; caller holds generation_lock."""
+        return sum(len(requests) for requests in self._generation_queues)
     
     def get_sprite(self, key, sprite_type, params=None, priority=5):
         """Get a sprite, returning placeholder if not ready."""
@@ -162,20 +260,22 @@ class SpriteManager:
             item_variant = params.get('item_variant', item_type)
             cache_key = f"item_{item_type}_{item_variant}"
         
-        # Check if sprite is ready in memory
-        with self.generation_lock:
-            if cache_key in self.sprites:
-                return self.sprites[cache_key]
+        # Check if sprite is ready in memory; a single dict lookup is atomic under the GIL,
+        # so the per-frame fast path skips the lock (workers only ever add finished sprites)
+        sprite = self.sprites.get(cache_key)
+        if sprite is not None:
+            return sprite
+        
+        # Already requested: the disk cache was checked then and the sprite is queued,
+        # so repeat requests (e.g. a level full of same-level monsters) share its placeholder
+        placeholder = self.placeholders.get(cache_key)
+        if placeholder is not None:
+            return placeholder
         
         # Check if sprite exists in cache on disk
         cached_sprite = self._check_disk_cache(cache_key, sprite_type, params)
         if cached_sprite:
-            with self.generation_lock:
-                self.sprites[cache_key] = cached_sprite
-                # Remove from placeholders if it was there
-                if cache_key in self.placeholders:
-                    del self.placeholders[cache_key]
-                    self.pending_count = max(0, self.pending_count - 1)
+            self.sprites[cache_key] = cached_sprite
             return cached_sprite
         
         # Queue for generation if not already queued or active
@@ -184,9 +284,12 @@ class SpriteManager:
         
         if not already_queued:
             self.placeholders[cache_key] = self._create_placeholder(sprite_type, params)
-            with self.generation_lock:
+            priority = min(max(priority, 0), GENERATION_PRIORITIES - 1)
+            with self._work_available:
                 self.pending_count += 1
-            self.generation_queue.put((priority, cache_key, sprite_type, params or {}))
+                self._generation_queues[priority].append((cache_key, sprite_type, params or {}))
+                self._work_available.notify()
+                self._scale_workers()
         
         # Handle case where placeholder might have been deleted (e.g., during regeneration)
         if cache_key not in self.placeholders:
@@ -200,98 +303,127 @@ class SpriteManager:
         sprite = self.get_sprite(key, 'monster', {'level': level})
         
         # Check for cached stats
-        stats_key = f"{key}_stats"
-        if stats_key not in self.sprites:
+        stats = self.monster_stats.get(key)
+        if stats is None:
             # Try to load stats from disk cache
-            import os
             stats_path = f"cache/monsters/monster_level_{level}_stats.txt"
-            if os.path.exists(stats_path):
+            if stats_path in self._disk_index:
                 try:
                     with open(stats_path, 'r') as f:
                         stats = f.read()
-                        self.sprites[stats_key] = stats
+                        self.monster_stats[key] = stats
                 except Exception as e:
                     print(f"Error loading cached stats {stats_path}: {e}")
         
-        stats = self.sprites.get(stats_key, f"Level {level} monster")
+        if stats is None:
+            stats = f"Level {level} monster"
         return sprite, stats
     
     
+    def purge(self, keys, cache_paths=()):
+        """Drop sprites and placeholders for the given keys in a single pass.
+        
+        cache_paths lists disk cache files the caller removed, so they stop counting as cached.
+        """
+        with self.generation_lock:
+            self._disk_index.difference_update(cache_paths)
+            self.sprites = {k: v for k, v in self.sprites.items() if k not in keys}
+            self.placeholders = {k: v for k, v in self.placeholders.items() if k not in keys}
+    
     def is_ready(self, key):
         """Check if a sprite is ready (not a placeholder)."""
-        with self.generation_lock:
-            return key in self.sprites
+        return key in self.sprites
+    
+    @staticmethod
+    def _scan_disk_cache():
+        """Return the set of file paths currently in the sprite cache directories."""
+        index = set()
+        for directory in (CACHE_SPRITES_DIR, CACHE_MONSTERS_DIR, CACHE_ITEMS_DIR):
+            try:
+                with os.scandir(directory) as entries:
+                    index.update(f"{directory}/{entry.name}" for entry in entries)
+            except FileNotFoundError:
+                continue
+        return index
+    
+    def _cache_path(self, key, sprite_type, params):
+        """Return the disk cache path a sprite is stored under, or None if it has none."""
+        resolver = self._cache_path_resolvers.get(sprite_type)
+        return resolver(key, params) if resolver else None
+    
+    @staticmethod
+    def _monster_cache_path(key, params):
+        """Cache path of a monster sprite, taking the level from params or the key."""
+        level = params.get('level') if params else int(key.split('_')[-1])
+        return f"cache/monsters/monster_level_{level}.png"
+    
+    @staticmethod
+    def _item_cache_path(key, params):
+        """Cache path of an item sprite from its type and variant, or from an item_<type>_<variant>_... key."""
+        item_type = params.get('item_type') if params else None
+        item_variant = params.get('item_variant') if params else None
+        if item_type and item_variant:
+            # Use consistent type and variant-based cache path
+            return f"cache/items/item_{item_type}_{item_variant}.png"
+        if item_type:
+            # Fallback to old format for backward compatibility
+            return f"cache/items/item_{item_type}.png"
+        
+        # Fallback: try to extract type and variant from the key
+        if key.startswith('item_'):
+            parts = key.split('_')
+            if len(parts) >= 3 and parts[1] in ('weapon', 'armor', 'potion'):  # item_type_variant_timestamp
+                return f"cache/items/item_{parts[1]}_{parts[2]}.png"
+        return None
     
     def _check_disk_cache(self, key, sprite_type, params):
         """Check if sprite exists in disk cache and load it."""
-        import os
-        import pygame
-        
-        cache_path = None
-        
-        if sprite_type == 'player':
-            cache_path = "cache/sprites/player.png"
-        elif sprite_type == 'monster':
-            level = params.get('level') if params else int(key.split('_')[-1])
-            cache_path = f"cache/monsters/monster_level_{level}.png"
-        elif sprite_type == 'item':
-            item_type = params.get('item_type') if params else None
-            item_variant = params.get('item_variant') if params else None
-            if item_type and item_variant:
-                # Use consistent type and variant-based cache path
-                cache_path = f"cache/items/item_{item_type}_{item_variant}.png"
-            elif item_type:
-                # Fallback to old format for backward compatibility
-                cache_path = f"cache/items/item_{item_type}.png"
-            else:
-                # Fallback: try to extract type from key or find any cached item
-                if key.startswith('item_'):
-                    parts = key.split('_')
-                    if len(parts) >= 3:  # item_type_variant_timestamp
-                        type_from_key = parts[1]
-                        variant_from_key = parts[2]
-                        if type_from_key in ['weapon', 'armor', 'potion']:
-                            cache_path = f"cache/items/item_{type_from_key}_{variant_from_key}.png"
-                        else:
-                            cache_path = None
-                    else:
-                        cache_path = None
-                else:
-                    cache_path = None
-        elif sprite_type == 'stairway':
-            cache_path = "cache/sprites/stairway.png"
-        elif sprite_type == 'death':
-            cache_path = "cache/sprites/death.png"
+        cache_path = self._cache_path(key, sprite_type, params)
         
-        if cache_path and os.path.exists(cache_path):
+        # Consult the in-memory index instead of stat()ing the disk on every miss
+        if cache_path and cache_path in self._disk_index:
             try:
-                sprite = pygame.image.load(cache_path)
+                sprite = load_sprite(cache_path)
                 
                 # Handle scaling for special sprite types
                 if sprite_type == 'monster' and params:
                     level = params.get('level', 1)
                     current_level = getattr(self, '_current_level', 1)
                     if level >= current_level + 2:  # Is mini-boss
-                        from constants import TILE_SIZE
-                        scaled_size = int(TILE_SIZE * 1.5)
-                        sprite = pygame.transform.scale(sprite, (scaled_size, scaled_size))
+                        sprite = scale_sprite_for_miniboss(sprite)
                 elif sprite_type == 'stairway':
                     # Scale stairway sprites to be more prominent
-                    from constants import TILE_SIZE, STAIRWAY_SCALE
-                    scaled_size = int(TILE_SIZE * STAIRWAY_SCALE)
-                    sprite = pygame.transform.scale(sprite, (scaled_size, scaled_size))
+                    sprite = scale_sprite_for_stairway(sprite)
                 
                 return sprite
+            except FileNotFoundError:
+                # Moved away since the index was built (e.g. archived for regeneration)
+                self._disk_index.discard(cache_path)
             except Exception as e:
                 print(f"Error loading cached sprite {cache_path}: {e}")
         
         return None
     
     def _create_placeholder(self, sprite_type, params):
-        """Create a placeholder sprite for the given type."""
+        """Return the placeholder sprite for the given type, drawing it only the first time."""
+        # Placeholders only vary by monster level and item type, so keys sharing those share a surface
+        if sprite_type == 'monster':
+            label_key = params.get('level', 1) if params else 1
+        elif sprite_type == 'item':
+            label_key = params.get('item_type', 'item') if params else 'item'
+        else:
+            label_key = None
+        
+        placeholder = self._placeholder_surfaces.get((sprite_type, label_key))
+        if placeholder is None:
+            placeholder = self._draw_placeholder(sprite_type, params)
+            self._placeholder_surfaces[(sprite_type, label_key)] = placeholder
+        return placeholder
+    
+    def _draw_placeholder(self, sprite_type, params):
+        """Draw a placeholder sprite for the given type."""
         # Determine size based on sprite type
         if sprite_type == 'stairway':
-            from constants import STAIRWAY_SCALE
             size = int(TILE_SIZE * STAIRWAY_SCALE)
         else:
             size = TILE_SIZE
@@ -347,42 +479,40 @@ class SpriteManager:
         
         # Draw text
         font_size = int(20 * (size / TILE_SIZE))  # Scale font with sprite size
-        font = pygame.font.Font(None, font_size)
+        font = self._placeholder_fonts.get(font_size)
+        if font is None:
+            font = pygame.font.Font(None, font_size)
+            self._placeholder_fonts[font_size] = font
         text_surface = font.render(text, True, text_color)
         text_rect = text_surface.get_rect(center=(size // 2, size // 2))
         surface.blit(text_surface, text_rect)
         
-        return surface
+        return convert_for_display(surface)
     
     def _preload_cache(self):
         """Load commonly used cached sprites immediately."""
-        import os
-        
         # Preload player sprite if cached
         player_path = "cache/sprites/player.png"
-        if os.path.exists(player_path):
+        if player_path in self._disk_index:
             try:
-                import pygame
-                self.sprites['player'] = pygame.image.load(player_path)
+                self.sprites['player'] = load_sprite(player_path)
             except Exception as e:
                 print(f"Error preloading player sprite: {e}")
         
         # Preload stairway sprite if cached
         stairway_path = "cache/sprites/stairway.png"
-        if os.path.exists(stairway_path):
+        if stairway_path in self._disk_index:
             try:
-                import pygame
-                self.sprites['stairway'] = pygame.image.load(stairway_path)
+                self.sprites['stairway'] = load_sprite(stairway_path)
             except Exception as e:
                 print(f"Error preloading stairway sprite: {e}")
         
         # Preload common item types
         for item_type in ['weapon', 'armor', 'potion']:
             item_path = f"cache/items/item_{item_type}.png"
-            if os.path.exists(item_path):
+            if item_path in self._disk_index:
                 try:
-                    import pygame
-                    self.sprites[f'item_{item_type}'] = pygame.image.load(item_path)
+                    self.sprites[f'item_{item_type}'] = load_sprite(item_path)
                 except Exception as e:
                     print(f"Error preloading {item_type} sprite: {e}")
     
@@ -393,7 +523,7 @@ class SpriteManager:
             actual_pending = len(self.placeholders) - len([k for k in self.placeholders.keys() if k in self.sprites])
             self.pending_count = max(0, actual_pending)
             
-            queue_size = self.generation_queue.qsize()
+            queue_size = self._queue_size()
             
             # Debug output if queue seems stuck
             if queue_size > 0 and len(self.active_generations) == 0:
@@ -411,7 +541,7 @@ class SpriteManager:
         """Print detailed queue state for debugging."""
         with self.generation_lock:
             print(f"=== Sprite Manager Debug ===")
-            print(f"Queue size: {self.generation_queue.qsize()}")
+            print(f"Queue size: {self._queue_size()}")
             print(f"Active generations: {len(self.active_generations)} - {list(self.active_generations)}")
             print(f"Placeholders: {len(self.placeholders)} - {list(self.placeholders.keys())[:5]}...")
             print(f"Sprites: {len(self.sprites)}")